@@ -0,0 +1,99 @@
+"""Measures messages per second through WindiaFAQ.process_commands
+
+Messages are routed for four kinds of traffic: chatter without the prefix,
+prefixed words that match nothing, FAQ commands and bot commands. Invoking a
+bot command and the listeners of a FAQ command are stubbed out, so only the
+dispatch stage itself is measured
+
+    python3 client/benchmarks/dispatch.py
+
+Needs no Mongo or calculator server, nothing is connected
+"""
+from pathlib import Path
+import asyncio
+import os
+import sys
+import time
+
+import discord
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# the client is created lazily and never used
+os.environ.setdefault("MONGO_CONNECT_URI", "mongodb://localhost")
+
+from windiafaq import static
+from windiafaq.database.types import Alias, Command
+from windiafaq.discord.bot import WindiaFAQ
+
+
+MESSAGES = 20000
+COMMANDS = 1000
+
+
+def make_message(bot: WindiaFAQ, content: str) -> discord.Message:
+    data = {
+        "id": 1,
+        "channel_id": 1,
+        "type": 0,
+        "content": content,
+        "author": {"id": 2, "username": "user", "discriminator": "0001", "avatar": None},
+        "attachments": [],
+        "embeds": [],
+        "mentions": [],
+        "mention_roles": [],
+        "pinned": False,
+        "mention_everyone": False,
+        "tts": False,
+        "timestamp": "2022-06-01T00:00:00+00:00",
+        "edited_timestamp": None,
+    }
+
+    return discord.Message(state=bot._connection, channel=discord.PartialMessageable(bot._connection, 1), data=data)
+
+
+async def measure(bot: WindiaFAQ, content: str) -> float:
+    message = make_message(bot, content)
+
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        await bot.process_commands(message)
+
+    return MESSAGES / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    bot = WindiaFAQ(static.BOT_PREFIX, "tcp://localhost:5555")
+    bot._connection.user = discord.ClientUser(state=bot._connection, data={"id": 3, "username": "bot", "discriminator": "0001", "avatar": None})
+    bot.db.cache.load(
+        [Command(f"command{i}", f"description {i}") for i in range(COMMANDS)],
+        [Alias(f"alias{i}", f"command{i}") for i in range(COMMANDS)],
+    )
+
+    @bot.command(name="time")
+    async def _time(ctx):
+        pass
+
+    async def invoke(ctx):
+        pass
+
+    bot.invoke = invoke
+    bot.dispatch = lambda event, *args, **kwargs: None
+
+    traffic = {
+        "chatter": "hello there, how do I wash HP?",
+        "miss": f"{static.BOT_PREFIX}nope",
+        "faq command": f"{static.BOT_PREFIX}command500",
+        "faq alias": f"{static.BOT_PREFIX}alias500",
+        "bot command": f"{static.BOT_PREFIX}time",
+    }
+
+    print(f"{'traffic':<12} {'messages/s':>12}")
+    for label, content in traffic.items():
+        print(f"{label:<12} {await measure(bot, content):>12,.0f}")
+
+    bot.executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""Counts the Mongo round trips and time of one FAQ lookup
+
+Compares the lookup FAQDatabase used to do (find_one on commands, then on
+aliases, then on commands again), the single aggregation of
+FAQDatabase.fetch_command and the cache behind FAQDatabase.get_command, for a
+command, an alias and a miss
+
+Needs a Mongo server, the one in docker-compose.yml will do:
+
+    MONGO_CONNECT_URI=mongodb://localhost:27017 python3 client/benchmarks/lookup_round_trips.py
+
+The entries are written to a throwaway database that is dropped afterwards
+"""
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+from pymongo import monitoring
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from windiafaq import static
+
+static.MONGO_DATABASE = "windia_benchmark"
+static.FAQ_SNAPSHOT_PATH = Path(tempfile.mkdtemp()) / "faq.snapshot"
+
+from windiafaq.database.database import FAQDatabase
+from windiafaq.database.types import Command
+
+
+REPEATS = 1000
+
+
+class RoundTrips(monitoring.CommandListener):
+    def __init__(self) -> None:
+        self.count = 0
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self.count += 1
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+def legacy_get_command(db: FAQDatabase, command_or_alias: str) -> Command | None:
+    # the lookup FAQDatabase.get_command did before the cache
+    if document := db._commands.find_one({"_id": command_or_alias}):
+        return Command.from_document(document)
+
+    if alias := db._aliases.find_one({"_id": command_or_alias}):
+        if document := db._commands.find_one({"_id": alias["command"]}):
+            return Command.from_document(document)
+
+    return None
+
+
+def measure(round_trips: RoundTrips, lookup, name: str) -> tuple[float, float]:
+    count = round_trips.count
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        lookup(name)
+
+    elapsed = time.perf_counter() - start
+    return (round_trips.count - count) / REPEATS, elapsed / REPEATS * 1e6
+
+
+def main() -> None:
+    round_trips = RoundTrips()
+    monitoring.register(round_trips)
+
+    db = FAQDatabase()
+    db._client.drop_database(static.MONGO_DATABASE)
+
+    try:
+        db.add_command("hp", "HP washing")
+        db.add_alias("hpwash", "hp")
+        db.reload()
+
+        lookups = {
+            "3x find_one": lambda name: legacy_get_command(db, name),
+            "aggregation": db.fetch_command,
+            "cache": db.get_command,
+        }
+
+        print(f"{'lookup':<12} {'name':<8} {'round trips':>11} {'µs/lookup':>10}")
+        for label, lookup in lookups.items():
+            for kind, name in (("command", "hp"), ("alias", "hpwash"), ("miss", "nope")):
+                trips, micros = measure(round_trips, lookup, name)
+                print(f"{label:<12} {kind:<8} {trips:>11.2f} {micros:>10.1f}")
+    finally:
+        db._client.drop_database(static.MONGO_DATABASE)
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
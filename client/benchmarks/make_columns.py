@@ -0,0 +1,68 @@
+"""Times utils.make_columns against the formatter it replaced, and reading a
+cached $faq page from FAQCache, at 10k commands
+
+    python3 client/benchmarks/make_columns.py
+"""
+from pathlib import Path
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from windiafaq import static
+from windiafaq.database.cache import FAQCache
+from windiafaq.database.types import Command
+from windiafaq.utils import make_columns
+
+
+COMMANDS = 10000
+
+
+def old_make_columns(string_list: list[str], *, amount_columns: int = 3) -> str:
+    # the `+=` formatter make_columns replaced
+    longest_command = len(max(string_list, key=len))
+
+    chunked_strings: list[list[str]] = []
+
+    for i in range(0, len(string_list), amount_columns):
+        chunked_strings.append(string_list[i:i+amount_columns])
+
+    columns = ''
+    for chunked_string in chunked_strings:
+        line = ''
+        for s in chunked_string:
+            line += s + " " * (longest_command - len(s)) + "  "
+
+        columns += line.strip() + "\n"
+
+    return columns
+
+
+def best(statement, number: int) -> float:
+    # the best of 5 runs, in milliseconds per call
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1000
+
+
+def main() -> None:
+    rng = random.Random(0)
+    names = set()
+    while len(names) < COMMANDS:
+        names.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 16))))
+
+    names = sorted(names)
+    assert make_columns(names) == old_make_columns(names)
+
+    cache = FAQCache()
+    cache.load([Command(name, "description") for name in names], [])
+    cache.page(0, static.FAQ_PAGE_SIZE)
+
+    print(f"{len(names):,} names")
+    print(f"old make_columns      {best(lambda: old_make_columns(names), 20):8.3f} ms")
+    print(f"make_columns          {best(lambda: make_columns(names), 20):8.3f} ms")
+    print(f"cached $faq page      {best(lambda: cache.page(0, static.FAQ_PAGE_SIZE), 100000):8.5f} ms")
+
+
+if __name__ == "__main__":
+    main()
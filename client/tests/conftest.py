@@ -0,0 +1,81 @@
+from pathlib import Path
+import sys
+import time
+
+import mongomock
+import pytest
+
+# the client is run as `python3 client`, so windiafaq is imported from this folder
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from windiafaq import static
+from windiafaq.database import database
+
+
+class SlowCollection:
+    """A collection that sleeps before every call, standing in for a slow Mongo"""
+    def __init__(self, collection: mongomock.Collection, latency: float) -> None:
+        self.collection = collection
+        self.latency = latency
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.collection, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            time.sleep(self.latency)
+            return attr(*args, **kwargs)
+
+        return call
+
+
+class CountingCollection:
+    """A collection that counts the calls made on it, each one a round trip to Mongo"""
+    def __init__(self, collection: mongomock.Collection) -> None:
+        self.collection = collection
+        self.calls = 0
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.collection, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self.calls += 1
+            return attr(*args, **kwargs)
+
+        return call
+
+
+@pytest.fixture
+def mongo(monkeypatch, tmp_path) -> mongomock.MongoClient:
+    client = mongomock.MongoClient()
+    monkeypatch.setenv("MONGO_CONNECT_URI", "mongodb://localhost")
+    monkeypatch.setattr(database, "MongoClient", lambda *args, **kwargs: client)
+    monkeypatch.setattr(static, "FAQ_SNAPSHOT_PATH", tmp_path / "faq.snapshot")
+    return client
+
+
+@pytest.fixture
+def faq_database(mongo) -> database.FAQDatabase:
+    return database.FAQDatabase()
+
+
+@pytest.fixture
+def inject_latency():
+    def inject(db: database.FAQDatabase, latency: float) -> None:
+        db._commands = SlowCollection(db._commands, latency)
+        db._aliases = SlowCollection(db._aliases, latency)
+
+    return inject
+
+
+@pytest.fixture
+def count_round_trips():
+    def count(db: database.FAQDatabase) -> tuple[CountingCollection, CountingCollection]:
+        db._commands = CountingCollection(db._commands)
+        db._aliases = CountingCollection(db._aliases)
+        return db._commands, db._aliases
+
+    return count
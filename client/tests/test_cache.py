@@ -0,0 +1,91 @@
+import threading
+import time
+
+from windiafaq import utils
+from windiafaq.database.cache import FAQCache
+from windiafaq.database.transfer import parse_payload
+from windiafaq.database.types import Alias, Command
+
+
+def _cache() -> FAQCache:
+    cache = FAQCache()
+    cache.load(
+        [
+            Command("hp", "HP washing puts AP into HP and takes it back out with AP resets"),
+            Command("mp", "MP washing is cheaper than HP washing for magicians"),
+            Command("ees", "Equip enhancement scrolls add stars to equipment"),
+            Command("secret", "hidden HP washing notes", hidden=True),
+        ],
+        [Alias("hpwash", "hp")],
+    )
+    return cache
+
+
+def test_search_ranks_by_content():
+    cache = _cache()
+    results = [name for name, _ in cache.search.search("hp washing")]
+
+    assert sorted(results) == ["hp", "mp"]
+    assert cache.search.search("ap resets")[0][0] == "hp"
+    assert cache.search.search("scrolls")[0][0] == "ees"
+
+
+def test_search_index_follows_writes():
+    cache = _cache()
+
+    cache.put_command(Command("flames", "eternal flames reroll bonus stats"))
+    assert cache.search.search("eternal")[0][0] == "flames"
+
+    cache.update_command("flames", "powerful flames reroll bonus stats")
+    assert cache.search.search("eternal") == []
+    assert cache.search.search("powerful")[0][0] == "flames"
+
+    cache.remove_command("flames")
+    assert cache.search.search("powerful") == []
+
+    cache.put_command(Command("ees", "hidden now", hidden=True))
+    assert cache.search.search("scrolls") == []
+
+
+def test_search_stays_fast():
+    cache = FAQCache()
+    cache.load([Command(f"command{i}", f"entry {i} about washing stat{i % 100} and scroll{i % 37}") for i in range(5000)], [])
+
+    start = time.perf_counter()
+    for _ in range(100):
+        cache.search.search("washing stat42 scroll7")
+
+    assert (time.perf_counter() - start) / 100 < .01
+
+
+def test_only_user_lookups_count_towards_the_hit_rate():
+    cache = _cache()
+
+    cache.peek("hp")
+    cache.peek("nope")
+    parse_payload(b"commands:\n- command: hp\n  description: new\naliases:\n- alias: hpw\n  command: hpwash\n", cache, reserved=())
+    assert (cache.hits, cache.misses) == (0, 0)
+
+    cache.get_command("hpwash")
+    cache.get_command("nope")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_a_page_rendered_during_a_write_is_not_kept(monkeypatch):
+    cache = _cache()
+    make_columns = utils.make_columns
+    writer = threading.Thread(target=cache.put_command, args=(Command("aa", "added while rendering"),))
+
+    def render(names: list[str]) -> str:
+        # the write lands while the page is being rendered from the old names
+        writer.start()
+        writer.join(.1)
+        return make_columns(names)
+
+    monkeypatch.setattr(utils, "make_columns", render)
+    cache.page(0, 10)
+    writer.join()
+    monkeypatch.setattr(utils, "make_columns", make_columns)
+
+    assert "aa" in cache.page(0, 10)
+    assert cache.page_count(2) == 2
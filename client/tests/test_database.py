@@ -0,0 +1,100 @@
+import asyncio
+import tempfile
+import time
+
+import discord
+import pytest
+
+from windiafaq.database.database import AsyncFAQDatabase
+from windiafaq.database.transfer import parse_payload
+from windiafaq.database.types import Alias, Command
+
+
+async def _worst_delays(db: AsyncFAQDatabase, writes: int) -> tuple[float, float]:
+    # the worst lag of a 10ms timer and the slowest lookup while the writes run
+    lag = lookup = 0.
+
+    async def tick():
+        nonlocal lag, lookup
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(.01)
+            lag = max(lag, time.perf_counter() - start - .01)
+
+            start = time.perf_counter()
+            await db.get_command("hp")
+            lookup = max(lookup, time.perf_counter() - start)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.gather(*(db.add_command(f"command{i}", "description") for i in range(writes)))
+    ticker.cancel()
+    return lag, lookup
+
+
+@pytest.mark.parametrize("latency", [0., .2])
+def test_event_loop_stays_responsive_under_mongo_latency(faq_database, inject_latency, latency):
+    faq_database.cache.put_command(Command("hp", "description"))
+    inject_latency(faq_database, latency)
+    db = AsyncFAQDatabase(faq_database, max_workers=2)
+
+    start = time.perf_counter()
+    lag, lookup = asyncio.run(_worst_delays(db, writes=4))
+
+    # 4 writes on 2 workers wait out the injected latency at least twice, none of it on the loop
+    assert time.perf_counter() - start >= 2 * latency
+    assert lag < .05
+    assert lookup < .005
+    assert len(db.cache.commands) == 5
+
+
+def test_lookups_resolve_aliases_without_round_trips(faq_database, count_round_trips):
+    faq_database.add_command("hp", "HP washing")
+    faq_database.add_alias("hpwash", "hp")
+    commands, aliases = count_round_trips(faq_database)
+
+    assert faq_database.get_command("hp").description == "HP washing"
+    assert faq_database.get_command("hpwash").command == "hp"
+    assert faq_database.get_command("nope") is None
+    assert commands.calls == aliases.calls == 0
+
+    faq_database.update_command("hp", "HP washing, updated")
+    assert faq_database.get_command("hpwash").description == "HP washing, updated"
+
+    faq_database.delete_command("hp")
+    assert faq_database.get_command("hpwash") is None
+    assert faq_database.get_alias("hpwash") is None
+
+
+def test_export_round_trips_through_a_discord_file(faq_database):
+    faq_database.add_command("hp", "HP washing")
+    faq_database.add_command("mp", "MP washing")
+    faq_database.add_alias("hpwash", "hp")
+
+    with tempfile.TemporaryFile() as fp:
+        faq_database.export(fp)
+        fp.seek(0)
+        # discord.File takes anything that is not an io.IOBase for a path
+        file = discord.File(fp, filename="faq.yaml")
+        data = file.fp.read()
+
+    faq_database.delete_command("hp")
+    faq_database.delete_command("mp")
+    commands, aliases = parse_payload(data, faq_database.cache, reserved=())
+
+    assert [(c.command, c.description) for c in commands] == [("hp", "HP washing"), ("mp", "MP washing")]
+    assert [(a.alias, a.command) for a in aliases] == [("hpwash", "hp")]
+
+
+def test_an_import_that_fails_part_way_keeps_what_it_wrote(faq_database):
+    # a unique index the third alias breaks makes Mongo refuse it mid-write
+    faq_database._aliases.create_index("command", unique=True)
+    commands = [Command("hp", "HP washing"), Command("mp", "MP washing"), Command("str", "STR")]
+    aliases = [Alias("hpwash", "hp"), Alias("mpwash", "mp"), Alias("hpw", "hp"), Alias("s", "str")]
+
+    results = faq_database.import_entries(commands, aliases)
+
+    assert [result.status.split(":", 1)[0] for result in results] == ["added"] * 5 + ["failed", "skipped"]
+    assert results[5].name == "hpw"
+    assert {document["_id"] for document in faq_database._aliases.find()} == {"hpwash", "mpwash"}
+    assert faq_database.get_command("mpwash").command == "mp"
+    assert faq_database.get_command("hpw") is None
@@ -0,0 +1,65 @@
+import asyncio
+import math
+
+from discord.ext import commands
+import numpy as np
+import pytest
+
+from windiafaq import static
+from windiafaq.calculator import ees
+from windiafaq.discord.extensions import utility
+
+
+SAMPLES = 40000
+
+RATES = {
+    "ees": (static.WINDIA_EES_BASE_RATE, static.WINDIA_EES_MIN_RATE),
+    "aees": (static.WINDIA_AEES_BASE_RATE, static.WINDIA_AEES_MIN_RATE),
+}
+
+
+@pytest.mark.parametrize("rates", RATES)
+@pytest.mark.parametrize("start, end, delta", [(0, 5, 0), (0, 10, 0), (5, 12, 2), (7, 13, 3), (10, 15, 4), (12, 15, 1)])
+def test_chain_matches_simulation(rates, start, end, delta):
+    base_rate, min_rate = RATES[rates]
+    attempts, sf_prots_used = ees.simulate(start, end, delta, base_rate, min_rate, SAMPLES, np.random.default_rng(start * 100 + end * 10 + delta))
+    chain = ees.EESChain(start, end, delta, base_rate, min_rate)
+
+    for (mean, variance), samples in ((chain.attempts(), attempts), (chain.sf_prots(), sf_prots_used)):
+        # the sample mean within 4 standard errors, the sample deviation within 5%
+        assert abs(samples.mean() - mean) <= 4 * math.sqrt(variance / SAMPLES) + 1e-9
+        assert samples.std() == pytest.approx(math.sqrt(variance), rel=.05, abs=1e-9)
+
+    for q in static.WINDIA_EES_QUANTILES:
+        quantile = chain.attempts_quantile(q / 100)
+
+        # the exact quantile reaches `end` at least q% of the time, one attempt less does not
+        assert (attempts <= quantile).mean() >= q / 100 - .01
+        assert (attempts <= quantile - 1).mean() <= q / 100 + .01
+
+
+@pytest.mark.parametrize("analytic, simulated", [(ees.ees_analytic, ees.ees), (ees.aees_analytic, ees.aees)])
+@pytest.mark.parametrize("start, end", [(10, 10), (3, 2)])
+def test_no_attempts_needed_when_starting_at_or_above_end(analytic, simulated, start, end):
+    exact = analytic(start, end, 0, "-a")
+    sampled = simulated(start, end, 0)
+
+    assert len(exact["embeds"]) == len(sampled["embeds"]) == 1
+    assert exact["embeds"][0]["description"].startswith("Takes 0.00 ")
+    assert sampled["embeds"][0]["description"].startswith("Took 0.00 ")
+    assert set(exact["embeds"][0]["fields"][1]["value"].split("\n")) == {"0.00", "0", ""}
+
+
+def test_analytic_mode_only_answers_its_flag():
+    assert ees.ees_analytic(0, 10, 0) is None
+    assert ees.ees_analytic(0, 10, 0, "-x") == {"error": "Unknown flags: -x"}
+    assert ees.ees_analytic(0, 16, 0, "-a") == {"error": "End must be within 1-15"}
+
+
+@pytest.mark.parametrize("command", ["ees", "aees"])
+def test_unknown_flags_are_a_usage_error(command):
+    param = getattr(utility.Utility, f"_{command}").clean_params["flags"]
+
+    assert asyncio.run(commands.run_converters(None, param.converter, "-a", param)) == "-a"
+    with pytest.raises(commands.BadArgument, match="Unknown flags: -x"):
+        asyncio.run(commands.run_converters(None, param.converter, "-x", param))
@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import pytest
+
+from windiafaq.executor import ExecutorSaturatedError, JobExecutor
+
+
+def run(test, max_workers: int = 1, max_queue: int = 4):
+    async def main():
+        executor = JobExecutor(max_workers, max_queue)
+        try:
+            # warm up the worker, spawning it takes longer than any job below
+            await executor.run(time.sleep, 0)
+            await test(executor)
+        finally:
+            executor.shutdown()
+
+    asyncio.run(main())
+
+
+def test_cancelled_running_job_keeps_its_worker_until_done():
+    async def test(executor):
+        first = asyncio.create_task(executor.run(time.sleep, .5, message_id=1))
+        await asyncio.sleep(.1)
+        assert executor.running == 1
+
+        executor.cancel(1)
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        # the worker is still busy, so the next job has to wait for it
+        start = time.perf_counter()
+        second = asyncio.create_task(executor.run(time.sleep, 0))
+        await asyncio.sleep(.1)
+        assert (executor.running, executor.queued, executor.depth) == (1, 1, 2)
+
+        await second
+        assert time.perf_counter() - start >= .3
+        assert (executor.running, executor.queued) == (0, 0)
+
+    run(test)
+
+
+def test_cancelled_queued_job_never_runs():
+    async def test(executor):
+        first = asyncio.create_task(executor.run(time.sleep, .3))
+        queued = asyncio.create_task(executor.run(time.sleep, 10, message_id=1))
+        await asyncio.sleep(.05)
+        assert (executor.running, executor.queued) == (1, 1)
+
+        executor.cancel(1)
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        assert (executor.running, executor.queued) == (1, 0)
+        await first
+        assert executor.depth == 0
+
+    run(test)
+
+
+def test_saturated_executor_refuses_jobs():
+    async def test(executor):
+        jobs = [asyncio.create_task(executor.run(time.sleep, .1)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(time.sleep, 0)
+
+        await asyncio.gather(*jobs)
+
+    run(test, max_queue=2)
@@ -0,0 +1,82 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from windiafaq.calculator import leveling
+
+
+# the pure-Python simulator $leveling used before the batched engine, kept as the reference
+def _old_rand_stat(base: int) -> int:
+    limit = min(base, 10000)
+    pool_size = (limit * (limit + 1) // 2) + limit
+    randomized = random.randint(0, pool_size)
+    stat = 0
+
+    if randomized >= limit:
+        randomized -= limit
+        stat = 1 + int(math.floor((-1 + math.sqrt((8 * randomized) + 1)) // 2))
+
+    return stat
+
+
+def _old_calc_stat(base: int, is_attack: bool) -> list:
+    if base == 0:
+        return [0, 0]
+
+    randomized_result = 0
+    stat_modifier = 2.1 if not is_attack else 4.2
+    max_result = int(1 + (base / (stat_modifier * 1.05)))
+
+    for _ in range(100):
+        randomized_result = _old_rand_stat(max_result)
+
+        if randomized_result > 0:
+            break
+
+    return [randomized_result, max_result + 1]
+
+
+def _old_simulate_levels(base: int, is_attack: bool, level_until: int = 7) -> list:
+    leveling_gains = []
+
+    for _ in range(level_until - 1):
+        gain = _old_calc_stat(base, is_attack)
+        leveling_gains.append(gain)
+        base += gain[0]
+
+    return [base, leveling_gains]
+
+
+def _ks_statistic(a: np.ndarray, b: np.ndarray) -> float:
+    values = np.union1d(a, b)
+    cdf_a = np.searchsorted(np.sort(a), values, side="right") / len(a)
+    cdf_b = np.searchsorted(np.sort(b), values, side="right") / len(b)
+    return float(np.abs(cdf_a - cdf_b).max())
+
+
+OLD_SIMULATIONS = 3000
+NEW_SIMULATIONS = 20000
+
+
+@pytest.mark.parametrize("is_attack", [False, True])
+@pytest.mark.parametrize("base", [0, 1, 7, 40, 350, 3000, 30000])
+@pytest.mark.parametrize("level_until", [5, 7])
+def test_batched_engine_matches_old_simulator(base, is_attack, level_until):
+    random.seed(base * 10 + level_until)
+    old = [_old_simulate_levels(base, is_attack, level_until) for _ in range(OLD_SIMULATIONS)]
+    old_stats = np.array([stat for stat, _ in old])
+
+    gains, maxima = leveling.simulate(base, is_attack, level_until, NEW_SIMULATIONS, np.random.default_rng(base * 10 + level_until))
+    new_stats = base + gains.sum(axis=1)
+
+    # a two-sample Kolmogorov-Smirnov test at the 0.1% level
+    critical = 1.949 * math.sqrt((OLD_SIMULATIONS + NEW_SIMULATIONS) / (OLD_SIMULATIONS * NEW_SIMULATIONS))
+    assert _ks_statistic(old_stats, new_stats) <= critical
+
+    standard_error = math.hypot(old_stats.std() / math.sqrt(OLD_SIMULATIONS), new_stats.std() / math.sqrt(NEW_SIMULATIONS))
+    assert abs(old_stats.mean() - new_stats.mean()) <= 4 * standard_error + 1e-9
+
+    # the upper bound of the first level only depends on the base
+    assert set(maxima[:, 0]) == {old[0][1][0][1]}
@@ -0,0 +1,82 @@
+import math
+import random
+
+import pytest
+
+from windiafaq import static
+from windiafaq.calculator import flame, magic
+
+
+# the server's calculations, ported as written, to check the tables against
+def _server_magic(hp: float, modifier: float) -> float:
+    a = 0.0000333333 * modifier / hp
+    b = 0.023 * modifier / hp
+    c = -1.
+
+    root1 = (-1 * b + math.sqrt(b * b - 4. * a * c)) / (2 * a)
+    root2 = (-1 * b - math.sqrt(b * b - 4. * a * c)) / (2 * a)
+    return math.ceil(max(root1, root2))
+
+
+def _server_flame(level: float) -> tuple[float, ...]:
+    ranges = (static.WINDIA_FLAME_EFLAME_MIN_RANGE, static.WINDIA_FLAME_EFLAME_MAX_RANGE, static.WINDIA_FLAME_PFLAME_MIN_RANGE, static.WINDIA_FLAME_PFLAME_MAX_RANGE)
+    overall = tuple((math.floor(level * static.WINDIA_FLAME_OVERALL_MULTIPLIER / 20) + 1) * r for r in ranges)
+    item = tuple((math.floor(level / 20) + 1) * r for r in ranges)
+    return overall + item
+
+
+FLAGS = ["", "-l", "-s", "-e", "-d", "-el", "-ds", "es"]
+
+
+@pytest.mark.parametrize("flags", FLAGS)
+def test_magic_matches_server(flags):
+    rng = random.Random(flags)
+    for _ in range(3000):
+        hp = rng.choice((rng.randint(1, 1000), rng.randint(1, 100000), rng.randint(1, 5000000)))
+        spell_attack = rng.randint(1, 1000)
+
+        payload = magic.magic(hp, spell_attack, flags)
+        modifiers = magic._modifiers(float(spell_attack), magic.parse_flags(flags))
+        expected = [_server_magic(float(hp), modifier) for modifier in modifiers]
+
+        if payload is None:
+            # past the end of the table, left to the server
+            assert max(expected) > static.WINDIA_MAGIC_MAX_MAGIC
+            continue
+
+        assert payload["embeds"][0]["fields"][1]["value"] == "\n".join(str(int(value)) for value in expected)
+
+
+@pytest.mark.parametrize("flags, error", [
+    ("-ed", "Cannot have both elemental advantage and disadvantage"),
+    ("-ls", "Cannot have two staves"),
+    ("-e s", "Flags cannot contain spaces (ex. -es instead of -e -s)"),
+    ("-x", "Unknown flag: x"),
+])
+def test_magic_flag_errors_match_server(flags, error):
+    assert magic.magic(1000, 100, flags) == {"error": error}
+
+
+def test_magic_leaves_what_the_table_cannot_answer_to_the_server():
+    assert magic.magic(0, 100) is None
+    assert magic.magic(1000, -1) is None
+    assert magic.magic(10 ** 15, 1) is None
+
+
+def test_flame_matches_server():
+    for level in range(static.WINDIA_FLAME_MAX_LEVEL + 1):
+        assert flame.table()[level] == _server_flame(float(level))
+
+    payload = flame.flame(150)
+    assert payload["embeds"][0]["fields"][0]["value"] == "Overall: 64 - 160\nNot Overall: 32 - 80"
+    assert flame.flame(-1) is None
+    assert flame.flame(static.WINDIA_FLAME_MAX_LEVEL + 1) is None
+
+
+def test_tables_are_rebuilt_when_constants_change(monkeypatch):
+    assert len(magic.table()) == static.WINDIA_MAGIC_MAX_MAGIC + 1
+
+    monkeypatch.setattr(static, "WINDIA_MAGIC_MAX_MAGIC", 500)
+    monkeypatch.setattr(static, "WINDIA_FLAME_EFLAME_MAX_RANGE", 12.)
+    assert len(magic.table()) == 501
+    assert flame.table()[150][1] == _server_flame(150.)[1] == 192.
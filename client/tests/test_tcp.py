@@ -0,0 +1,182 @@
+import asyncio
+import json
+
+import pytest
+import zmq
+import zmq.asyncio
+
+from windiafaq import static, tracing
+from windiafaq.calculator import magic
+from windiafaq.tcp.breaker import CircuitOpenError
+from windiafaq.tcp.cache import make_key
+from windiafaq.tcp.client import RequestTimeoutError, TCPClient
+from windiafaq.tcp.response import ServerResponseError
+
+
+class StandInServer:
+    """A ROUTER socket standing in for the calculator server
+
+    Replies echo the command and its args. While `holding`, requests are
+    kept instead of answered, and :meth:`release` answers them in reverse
+    order. While `down`, requests other than pings are dropped, and pings
+    too while `pings_down`
+    """
+    def __init__(self) -> None:
+        self.context = zmq.asyncio.Context()
+        self.sock = self.context.socket(zmq.ROUTER)
+        self.endpoint = f"tcp://127.0.0.1:{self.sock.bind_to_random_port('tcp://127.0.0.1')}"
+
+        self.down = False
+        self.pings_down = False
+        self.holding = False
+        self.held: list[list[bytes]] = []
+        self.received: list[dict] = []
+        self._task = asyncio.create_task(self._serve())
+
+    async def _serve(self) -> None:
+        while True:
+            identity, delimiter, body = await self.sock.recv_multipart()
+            request = json.loads(body)
+            self.received.append(request)
+
+            if request["command"] == "ping" and not self.pings_down:
+                await self._reply([identity, delimiter, body])
+            elif self.holding:
+                self.held.append([identity, delimiter, body])
+            elif not self.down:
+                await self._reply([identity, delimiter, body])
+
+    async def _reply(self, frames: list[bytes]) -> None:
+        identity, delimiter, body = frames
+        request = json.loads(body)
+
+        if request["command"] == "fail":
+            reply = {"id": request["id"], "error": "fail event does not exist"}
+        else:
+            reply = {"id": request["id"], "content": f"{request['command']} {request['args']}"}
+
+        await self.sock.send_multipart([identity, delimiter, json.dumps(reply).encode()])
+
+    async def release(self) -> None:
+        self.holding = False
+        for frames in reversed(self.held):
+            await self._reply(frames)
+
+        self.held.clear()
+
+    def close(self) -> None:
+        self._task.cancel()
+        self.sock.close(0)
+        self.context.term()
+
+
+def run(test):
+    async def main():
+        server = StandInServer()
+        client = TCPClient(server.endpoint)
+        client.connect()
+
+        try:
+            await test(server, client)
+        finally:
+            client.disconnect()
+            server.close()
+
+    asyncio.run(main())
+
+
+def test_replies_are_routed_by_request_id():
+    async def test(server, client):
+        server.holding = True
+        requests = [asyncio.create_task(client.request("flame", level)) for level in range(5)]
+
+        while len(server.held) < 5:
+            await asyncio.sleep(.01)
+
+        # answered in the reverse order they were sent
+        await server.release()
+        responses = await asyncio.gather(*requests)
+
+        assert [resp.content for resp in responses] == [f"flame [{level}]" for level in range(5)]
+        assert client.pending == 0
+
+    run(test)
+
+
+def test_server_errors_are_raised_and_do_not_count_as_failures():
+    async def test(server, client):
+        with pytest.raises(ServerResponseError, match="fail event does not exist"):
+            await client.request("fail")
+
+        assert client.breaker.failures == 0
+
+    run(test)
+
+
+def test_request_times_out():
+    async def test(server, client):
+        server.down = True
+
+        with pytest.raises(RequestTimeoutError):
+            await client.request("flame", 150, timeout=.1)
+
+        assert client.pending == 0
+        assert client.breaker.failures == 1
+        assert not client.breaker.is_open
+
+    run(test)
+
+
+def test_circuit_opens_on_threshold_and_probe_closes_it(monkeypatch):
+    monkeypatch.setattr(static, "TCP_PROBE_INTERVAL", .05)
+    monkeypatch.setattr(static, "TCP_REQUEST_TIMEOUT", .1)
+
+    async def test(server, client):
+        server.down = server.pings_down = True
+
+        for _ in range(client.breaker.threshold):
+            with pytest.raises(RequestTimeoutError):
+                await client.request("flame", 150, timeout=.1)
+
+        assert client.breaker.is_open
+        with pytest.raises(CircuitOpenError):
+            await client.request("flame", 150)
+
+        # the probe keeps pinging while the server is down
+        await asyncio.sleep(.3)
+        assert client.breaker.is_open
+        assert sum(request["command"] == "ping" for request in server.received) >= 2
+
+        server.down = server.pings_down = False
+        for _ in range(50):
+            if not client.breaker.is_open:
+                break
+
+            await asyncio.sleep(.02)
+
+        assert not client.breaker.is_open
+        assert (await client.request("flame", 150)).content == "flame [150]"
+
+    run(test)
+
+
+def test_requests_carry_the_trace_id_and_add_their_spans():
+    async def test(server, client):
+        with tracing.start_trace("flame") as trace:
+            await client.request("flame", 150)
+
+        assert server.received[-1]["trace"] == trace.trace_id
+        assert [s.name for s in trace.spans] == ["tcp/send", "tcp/transport"]
+
+    run(test)
+
+
+def test_flags_in_any_order_share_a_cache_key():
+    assert make_key("magic", (5000000, 670, "-se")) == make_key("magic", (5000000, 670, " -es"))
+    assert make_key("magic", (5000000, 670, "-s -e")) == make_key("magic", (5000000, 670, "-e  -s"))
+    assert magic.magic(5000000, 670, "-se") == magic.magic(5000000, 670, "-es")
+
+    # a repeated staff is refused, so it must not share the key of a single one
+    assert make_key("magic", (5000000, 670, "-ll")) != make_key("magic", (5000000, 670, "-l"))
+    assert make_key("magic", (5000000, 670, "-s -e")) != make_key("magic", (5000000, 670, "-es"))
+    assert make_key("ees", (0, 10, 0, "")) == ("ees", 0, 10, 0, "")
@@ -0,0 +1,73 @@
+import time
+
+from loguru import logger
+import pytest
+
+from windiafaq import static, tracing
+from windiafaq.tcp.response import Response
+
+
+def test_span_is_recorded_even_if_the_block_raises():
+    trace = tracing.Trace("flame")
+
+    with pytest.raises(ValueError):
+        with trace.span("local"):
+            raise ValueError
+
+    assert [s.name for s in trace.spans] == ["local"]
+    assert trace.spans[0].source == "client"
+
+
+def test_server_timings_are_placed_from_when_the_request_was_sent():
+    trace = tracing.Trace("flame")
+    sent = time.perf_counter()
+
+    server = trace.merge([
+        {"name": "queue", "start": 0., "duration": 2.},
+        {"name": "handle", "start": 2., "duration": 10.},
+    ], sent)
+
+    assert server == pytest.approx(.012)
+    queue, handle = trace.spans
+    assert (queue.source, handle.source) == ("server", "server")
+    assert handle.start == pytest.approx(trace.offset(sent) + .002)
+    assert handle.duration == pytest.approx(.01)
+
+
+def test_module_span_only_records_inside_a_trace():
+    with tracing.span("nothing to record into"):
+        pass
+
+    with tracing.start_trace("flame") as trace:
+        assert tracing.current.get() is trace
+        with tracing.span("local"):
+            pass
+
+    assert tracing.current.get() is None
+    assert [s.name for s in trace.spans] == ["local"]
+
+
+@pytest.mark.parametrize("threshold, logged", [(0., True), (60., False)])
+def test_only_slow_traces_are_logged(monkeypatch, threshold, logged):
+    monkeypatch.setattr(static, "TRACE_SLOW_THRESHOLD", threshold)
+    messages = []
+    sink = logger.add(messages.append, level="WARNING")
+
+    try:
+        with tracing.start_trace("flame") as trace:
+            with tracing.span("local"):
+                pass
+    finally:
+        logger.remove(sink)
+
+    assert len(messages) == logged
+    if logged:
+        assert trace.trace_id in messages[0] and "local" in messages[0]
+
+
+def test_response_keeps_the_trace_out_of_its_payload():
+    resp = Response(trace="abc", timings=[{"name": "handle", "start": 0., "duration": 1.}], content="flame")
+
+    assert resp == {"content": "flame"}
+    assert resp.timings == [{"name": "handle", "start": 0., "duration": 1.}]
+    assert Response(content="flame").timings == []
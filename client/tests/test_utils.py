@@ -0,0 +1,53 @@
+import random
+import string
+
+import pytest
+
+from windiafaq.utils import format_float, make_columns
+
+
+# the `+=` formatter make_columns replaced, whose output must not change
+def _old_make_columns(string_list: list[str], *, amount_columns: int = 3) -> str:
+    longest_command = len(max(string_list, key=len))
+
+    chunked_strings: list[list[str]] = []
+
+    for i in range(0, len(string_list), amount_columns):
+        chunked_strings.append(string_list[i:i+amount_columns])
+
+    columns = ''
+    for chunked_string in chunked_strings:
+        line = ''
+        for s in chunked_string:
+            line += s + " " * (longest_command - len(s)) + "  "
+
+        columns += line.strip() + "\n"
+
+    return columns
+
+
+@pytest.mark.parametrize("amount", [1, 2, 3, 4, 59, 60, 61, 1000])
+@pytest.mark.parametrize("amount_columns", [1, 3, 4])
+def test_make_columns_matches_old_formatter(amount, amount_columns):
+    rng = random.Random(amount * 10 + amount_columns)
+    names = sorted("".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 20))) for _ in range(amount))
+
+    assert make_columns(names, amount_columns=amount_columns) == _old_make_columns(names, amount_columns=amount_columns)
+
+
+def test_make_columns_of_nothing_is_empty():
+    assert make_columns([]) == ""
+
+
+@pytest.mark.parametrize("value, expected", [
+    (0., "0"),
+    (150., "150"),
+    (1.3, "1.3"),
+    (0.1 + 0.2, "0.30000000000000004"),
+    (1e21, "1000000000000000000000"),
+    (1.5e-7, "0.00000015"),
+    (-2.5, "-2.5"),
+])
+def test_format_float_matches_go(value, expected):
+    # strconv.FormatFloat(value, 'f', -1, 64)
+    assert format_float(value) == expected
@@ -0,0 +1,136 @@
+from pathlib import Path
+import time
+
+from pymongo.errors import OperationFailure
+import pytest
+
+from windiafaq import static
+from windiafaq.database import watcher
+from windiafaq.database.types import Alias, Command
+
+
+class RefusingDatabase:
+    """A database whose change streams are always refused, as without permissions"""
+    def __init__(self) -> None:
+        self.attempts = 0
+
+    def watch(self, *args, **kwargs):
+        self.attempts += 1
+        raise OperationFailure("not authorized to run changeStream", code=13)
+
+
+class RefusingClient:
+    def __init__(self, *args, **kwargs) -> None:
+        self.database = RefusingDatabase()
+
+    def get_database(self, name: str) -> RefusingDatabase:
+        return self.database
+
+    def close(self) -> None:
+        pass
+
+
+def test_refused_change_stream_is_retried_after_a_delay(monkeypatch, faq_database):
+    monkeypatch.setattr(watcher, "MongoClient", RefusingClient)
+    monkeypatch.setattr(static, "MONGO_WATCH_RETRY_DELAY", .1)
+
+    change_watcher = watcher.ChangeWatcher(faq_database)
+    change_watcher.start()
+    time.sleep(.35)
+    change_watcher.stop()
+    change_watcher.join(1)
+
+    assert not change_watcher.is_alive()
+    assert 2 <= change_watcher._client.database.attempts <= 5
+
+
+def _change(operation: str, collection: str, key: str, document: dict | None = None) -> dict:
+    return {"operationType": operation, "ns": {"coll": collection}, "documentKey": {"_id": key}, "fullDocument": document}
+
+
+def test_changes_are_applied_to_the_cache(monkeypatch, faq_database):
+    monkeypatch.setattr(watcher, "MongoClient", RefusingClient)
+    change_watcher = watcher.ChangeWatcher(faq_database)
+    cache = faq_database.cache
+
+    change_watcher.apply(_change("insert", static.MONGO_COLLECTION_COMMANDS, "hp", Command("hp", "HP washing").to_document()))
+    change_watcher.apply(_change("insert", static.MONGO_COLLECTION_ALIASES, "hpwash", Alias("hpwash", "hp").to_document()))
+    assert cache.peek("hpwash").description == "HP washing"
+
+    change_watcher.apply(_change("update", static.MONGO_COLLECTION_COMMANDS, "hp", Command("hp", "HP washing, updated").to_document()))
+    assert cache.peek("hpwash").description == "HP washing, updated"
+
+    change_watcher.apply(_change("delete", static.MONGO_COLLECTION_COMMANDS, "hp"))
+    assert cache.peek("hp") is None and cache.peek("hpwash") is None
+    assert change_watcher.applied == 4
+
+
+
+def test_drop_reloads_the_cache_and_invalidate_reopens_the_stream(monkeypatch, faq_database):
+    monkeypatch.setattr(watcher, "MongoClient", RefusingClient)
+    change_watcher = watcher.ChangeWatcher(faq_database)
+    change_watcher._reload_on_open = False
+    change_watcher._resume_token = {"_data": "token"}
+    faq_database.cache.put_command(Command("hp", "HP washing"))
+
+    # written behind the cache's back, as by a process whose changes were missed
+    faq_database._commands.delete_many({})
+    faq_database._commands.insert_one(Command("mp", "MP washing").to_document())
+
+    change_watcher.apply({"operationType": "drop", "ns": {"db": static.MONGO_DATABASE, "coll": static.MONGO_COLLECTION_COMMANDS}})
+    assert faq_database.cache.peek("hp") is None
+    assert faq_database.cache.peek("mp").description == "MP washing"
+    # the stream goes on from where it is
+    assert not change_watcher._reload_on_open and change_watcher._resume_token == {"_data": "token"}
+
+    change_watcher.apply({"operationType": "invalidate"})
+    assert change_watcher._reload_on_open and change_watcher._resume_token is None
+
+
+class QuietStream:
+    """A change stream that stays open without any change"""
+    alive = True
+    resume_token = {"_data": "token"}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def try_next(self) -> None:
+        time.sleep(.01)
+
+
+class QuietClient(RefusingClient):
+    def __init__(self, *args, **kwargs) -> None:
+        self.opened = 0
+
+    def get_database(self, name: str) -> "QuietClient":
+        return self
+
+    def watch(self, *args, **kwargs) -> QuietStream:
+        self.opened += 1
+        return QuietStream()
+
+
+@pytest.mark.parametrize("reload_on_open, reloads", [(True, 1), (False, 0)])
+def test_reload_at_start_can_be_skipped(monkeypatch, faq_database, reload_on_open, reloads):
+    monkeypatch.setattr(watcher, "MongoClient", QuietClient)
+    reloaded = []
+    monkeypatch.setattr(faq_database, "reload", lambda: reloaded.append(True))
+
+    change_watcher = watcher.ChangeWatcher(faq_database, reload_on_open=reload_on_open)
+    change_watcher.start()
+    time.sleep(.1)
+    change_watcher.stop()
+    change_watcher.join(1)
+
+    assert change_watcher._client.opened == 1
+    assert len(reloaded) == reloads
+    assert change_watcher._resume_token == {"_data": "token"}
+
+
+def test_snapshot_path_does_not_depend_on_the_working_directory():
+    assert static.FAQ_SNAPSHOT_PATH.is_absolute()
+    assert static.FAQ_SNAPSHOT_PATH.parent == Path(static.__file__).parent.parent
@@ -0,0 +1,351 @@
+"""Local EES/AEES calculations
+
+:func:`simulate` runs the same enhancement rules as the calculator server as a
+vectorized batch simulation, and :func:`ees`/:func:`aees` build the same
+response payload, so they can answer `$ees`/`$aees` when the server is
+unavailable
+
+:class:`EESChain` solves the same rules exactly as an absorbing Markov chain
+over the star levels, which backs the analytic `-a` mode
+"""
+from typing import Any
+import math
+
+import numpy as np
+
+from windiafaq import static
+
+
+__all__ = ["validate", "success_rates", "simulate", "ees", "aees", "EESChain", "ees_analytic", "aees_analytic"]
+
+
+def validate(start: int, end: int, delta: int) -> str | None:
+    """Checks the arguments of an EES simulation
+
+    Returns
+    -------
+    :class:`str`
+        The error the server would reply with
+    :class:`None`
+        If the arguments are valid
+    """
+    if start < 0 or start > 14:
+        return "Start must be within 0-14"
+
+    if end < 1 or end > 15:
+        return "End must be within 1-15"
+
+    if delta < 0 or delta > 4:
+        return "Delta must be within 0-4"
+
+    return None
+
+
+def success_rates(base_rate: float, min_rate: float) -> np.ndarray:
+    """The success threshold of every star level, out of a roll between 0 and 100"""
+    return np.array([math.ceil(max(base_rate - static.WINDIA_EES_REDUCTION_RATE * level, min_rate) * 100) for level in range(16)])
+
+
+def protected(levels: np.ndarray, delta: int) -> np.ndarray:
+    """Whether or not a SF Protect is used when enhancing at each level"""
+    return (levels % 5 >= 5 - delta) & (levels > 5)
+
+
+def simulate(start: int, end: int, delta: int, base_rate: float, min_rate: float, samples: int = static.WINDIA_EES_SAMPLES, rng: np.random.Generator | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Simulates enhancing from `start` to `end` stars `samples` times
+
+    A success adds a star. A failure drops a star unless a SF Protect was used
+    or the item is at a safety point (a multiple of 5)
+
+    Returns
+    -------
+    :class:`tuple`[:class:`np.ndarray`, :class:`np.ndarray`]
+        The attempts and the SF Protects used by every sample
+    """
+    rng = rng or np.random.default_rng()
+    probabilities = (success_rates(base_rate, min_rate) + 1) / 101
+
+    levels = np.full(samples, start, dtype=np.int64)
+    attempts = np.zeros(samples, dtype=np.int64)
+    sf_prots_used = np.zeros(samples, dtype=np.int64)
+
+    # a failure at a safety point or with a SF Protect keeps the level, so the
+    # attempts spent there until a success are drawn at once
+    level = np.arange(16)
+    sf_prot_used = protected(level, delta)
+    keeps_level = sf_prot_used | (level % 5 == 0)
+
+    active = np.flatnonzero(levels < end)
+    while len(active):
+        level = levels[active]
+        probability = probabilities[level]
+        keeps = keeps_level[level]
+
+        tries = np.where(keeps, rng.geometric(probability), 1)
+        success = keeps | (rng.random(len(active)) < probability)
+
+        levels[active] = np.where(success, level + 1, level - 1)
+        attempts[active] += tries
+        sf_prots_used[active] += tries * sf_prot_used[level]
+
+        active = active[levels[active] < end]
+
+    return attempts, sf_prots_used
+
+
+def _stats(values: np.ndarray) -> tuple[str, str, str]:
+    return f"{values.mean():,.2f}", f"{values.min():,.0f}", f"{values.max():,.0f}"
+
+
+def _sf_prots_embed(title: str, start: int, end: int, samples: int, sf_prots_used: np.ndarray) -> dict[str, Any]:
+    avg, low, high = _stats(sf_prots_used)
+    vp = sf_prots_used * static.WINDIA_EES_SF_PROT_VP_COST
+    credits = sf_prots_used * static.WINDIA_EES_SF_PROT_CREDITS_COST
+
+    return {
+        "title": title,
+        "description": f"Took {avg} SF protects on average over {samples:,} samples to go from {start}* to {end}*",
+        "fields": [
+            {
+                "name": "Stats",
+                "value": "Average SF Protects Used\nMinimum SF Protects Used\nMaximum SF Protects Used\n\nAverage VP/Credits Used\nMinimum VP/Credits Used\nMaximum VP/Credits Used",
+                "inline": True,
+            },
+            {
+                "name": "Simulated Values",
+                "value": f"{avg}\n{low}\n{high}\n\n{vp.mean():,.2f}/{credits.mean():,.2f}\n{vp.min():,.0f}/{credits.min():,.0f}\n{vp.max():,.0f}/{credits.max():,.0f}",
+                "inline": True,
+            },
+        ],
+    }
+
+
+def ees(start: int, end: int, delta: int, flags: str = "") -> dict[str, Any]:
+    """Simulates EES and builds the payload the server replies to `ees` with"""
+    if error := validate(start, end, delta):
+        return {"error": error}
+
+    samples = static.WINDIA_EES_SAMPLES
+    attempts, sf_prots_used = simulate(start, end, delta, static.WINDIA_EES_BASE_RATE, static.WINDIA_EES_MIN_RATE, samples)
+
+    avg, low, high = _stats(attempts)
+    meso = _stats(attempts * static.WINDIA_EES_MESO_COST)
+
+    embeds = [{
+        "title": "EES Simulator",
+        "description": f"Took {avg} EES on average over {samples:,} samples to go from {start}* to {end}*",
+        "fields": [
+            {
+                "name": "Stats",
+                "value": "Average EES Used\nMinimum EES Used\nMaximum EES Used\n\nAverage Meso Used\nMinimum Meso Used\nMaximum Meso Used",
+                "inline": True,
+            },
+            {
+                "name": "Simulated Values",
+                "value": "\n".join((avg, low, high, "", *meso)),
+                "inline": True,
+            },
+        ],
+    }]
+
+    if sf_prots_used.any():
+        embeds.append(_sf_prots_embed("EES Simulator", start, end, samples, sf_prots_used))
+
+    return {"embeds": embeds}
+
+
+def aees(start: int, end: int, delta: int, flags: str = "") -> dict[str, Any]:
+    """Simulates AEES and builds the payload the server replies to `aees` with"""
+    if error := validate(start, end, delta):
+        return {"error": error}
+
+    samples = static.WINDIA_EES_SAMPLES
+    attempts, sf_prots_used = simulate(start, end, delta, static.WINDIA_AEES_BASE_RATE, static.WINDIA_AEES_MIN_RATE, samples)
+
+    avg, low, high = _stats(attempts)
+    meso = _stats(attempts * static.WINDIA_EES_MESO_COST)
+    cogs = _stats(attempts * static.WINDIA_AEES_COG_COST)
+    ees_used = _stats(attempts * static.WINDIA_AEES_EES_COST)
+
+    embeds = [{
+        "title": "AEES Simulator",
+        "description": f"Took {avg} AEES on average over {samples:,} samples to go from {start}* to {end}*",
+        "fields": [
+            {
+                "name": "Stats",
+                "value": "Average AEES Used\nMinimum AEES Used\nMaximum AEES Used\n\nAverage Meso Used\nMinimum Meso Used\nMaximum Meso Used\n\nAverage COGs Used\nMinimum COGs Used\nMaximum COGs Used\n\nAverage EES Used\nMinimum EES Used\nMaximum EES Used",
+                "inline": True,
+            },
+            {
+                "name": "Simulated Values",
+                "value": "\n".join((avg, low, high, "", *meso, "", *cogs, "", *ees_used)),
+                "inline": True,
+            },
+        ],
+    }]
+
+    if sf_prots_used.any():
+        embeds.append(_sf_prots_embed("AEES Simulator", start, end, samples, sf_prots_used))
+
+    return {"embeds": embeds}
+
+
+class EESChain:
+    """Star enhancement as an absorbing Markov chain
+
+    Every star level below `end` is a transient state and reaching `end`
+    absorbs. Expected totals and their variances come from the fundamental
+    matrix, quantiles of the attempts from powers of the transient matrix.
+    Starting at or above `end` takes no attempts, as on the server
+
+    Attributes
+    ----------
+    start : :class:`int`
+        The starting star level
+
+    end : :class:`int`
+        The star level to reach
+
+    delta : :class:`int`
+        The amount of stars before a safety point a SF Protect is used at
+    """
+    def __init__(self, start: int, end: int, delta: int, base_rate: float, min_rate: float) -> None:
+        self.start = start
+        self.end = end
+        self.delta = delta
+
+        probabilities = (success_rates(base_rate, min_rate) + 1) / 101
+        level = np.arange(end)
+        self.sf_prot_used = protected(level, delta).astype(np.float64)
+        keeps_level = self.sf_prot_used.astype(bool) | (level % 5 == 0)
+
+        self.transitions = np.zeros((end, end))
+        for lv in range(end):
+            if lv + 1 < end:
+                self.transitions[lv, lv + 1] = probabilities[lv]
+
+            self.transitions[lv, lv if keeps_level[lv] else lv - 1] += 1 - probabilities[lv]
+
+        self._fundamental = np.eye(end) - self.transitions
+
+    def moments(self, rewards: np.ndarray) -> tuple[float, float]:
+        """The mean and variance of a reward collected on every attempt
+
+        Parameters
+        ----------
+        rewards : :class:`np.ndarray`
+            The reward of an attempt at each star level
+        Returns
+        -------
+        :class:`tuple`[:class:`float`, :class:`float`]
+            The mean and the variance of the total reward from `start` to `end`
+        """
+        if self.start >= self.end:
+            return 0., 0.
+
+        first = np.linalg.solve(self._fundamental, rewards)
+        second = np.linalg.solve(self._fundamental, rewards * rewards + 2 * rewards * (self.transitions @ first))
+        return float(first[self.start]), float(max(second[self.start] - first[self.start] ** 2, 0.))
+
+    def attempts(self) -> tuple[float, float]:
+        return self.moments(np.ones(self.end))
+
+    def sf_prots(self) -> tuple[float, float]:
+        return self.moments(self.sf_prot_used)
+
+    def _unfinished(self, n: int) -> float:
+        # the probability that `end` has not been reached after n attempts
+        return float(np.linalg.matrix_power(self.transitions, n)[self.start].sum())
+
+    def attempts_quantile(self, q: float) -> int:
+        """The lowest amount of attempts that reaches `end` with a probability of at least `q`"""
+        if self.start >= self.end:
+            return 0
+
+        high = 1
+        while self._unfinished(high) > 1 - q:
+            high *= 2
+
+        low = high // 2
+        while low + 1 < high:
+            mid = (low + high) // 2
+            if self._unfinished(mid) > 1 - q:
+                low = mid
+            else:
+                high = mid
+
+        return high
+
+
+def _analytic(name: str, base_rate: float, min_rate: float, start: int, end: int, delta: int, flags: str, costs: tuple[tuple[str, float], ...]) -> dict[str, Any] | None:
+    if flags == "":
+        return None
+
+    if flags != "-a":
+        return {"error": f"Unknown flags: {flags}"}
+
+    if error := validate(start, end, delta):
+        return {"error": error}
+
+    chain = EESChain(start, end, delta, base_rate, min_rate)
+    mean, variance = chain.attempts()
+    deviation = variance ** .5
+    quantiles = [chain.attempts_quantile(q / 100) for q in static.WINDIA_EES_QUANTILES]
+
+    names, values = [f"Expected {name} Used", "Standard Deviation"], [f"{mean:,.2f}", f"{deviation:,.2f}"]
+    for q, quantile in zip(static.WINDIA_EES_QUANTILES, quantiles):
+        names.append(f"{q}th Percentile {name} Used")
+        values.append(f"{quantile:,}")
+
+    for item, cost in costs:
+        names += ["", f"Expected {item} Used", "Standard Deviation"]
+        values += ["", f"{mean * cost:,.2f}", f"{deviation * cost:,.2f}"]
+
+    embeds = [{
+        "title": f"{name} Calculator",
+        "description": f"Takes {mean:,.2f} {name} on average to go from {start}* to {end}*",
+        "fields": [
+            {"name": "Stats", "value": "\n".join(names), "inline": True},
+            {"name": "Exact Values", "value": "\n".join(values), "inline": True},
+        ],
+    }]
+
+    sf_prots_mean, sf_prots_variance = chain.sf_prots()
+    if sf_prots_mean > 0.:
+        sf_prots_deviation = sf_prots_variance ** .5
+        vp, credits = static.WINDIA_EES_SF_PROT_VP_COST, static.WINDIA_EES_SF_PROT_CREDITS_COST
+
+        embeds.append({
+            "title": f"{name} Calculator",
+            "description": f"Takes {sf_prots_mean:,.2f} SF protects on average to go from {start}* to {end}*",
+            "fields": [
+                {
+                    "name": "Stats",
+                    "value": "Expected SF Protects Used\nStandard Deviation\n\nExpected VP/Credits Used\nStandard Deviation",
+                    "inline": True,
+                },
+                {
+                    "name": "Exact Values",
+                    "value": f"{sf_prots_mean:,.2f}\n{sf_prots_deviation:,.2f}\n\n{sf_prots_mean * vp:,.2f}/{sf_prots_mean * credits:,.2f}\n{sf_prots_deviation * vp:,.2f}/{sf_prots_deviation * credits:,.2f}",
+                    "inline": True,
+                },
+            ],
+        })
+
+    return {"embeds": embeds}
+
+
+def ees_analytic(start: int, end: int, delta: int, flags: str = "") -> dict[str, Any] | None:
+    """Solves EES exactly when `flags` is `-a`, otherwise returns :class:`None`"""
+    return _analytic("EES", static.WINDIA_EES_BASE_RATE, static.WINDIA_EES_MIN_RATE, start, end, delta, flags, (
+        ("Meso", static.WINDIA_EES_MESO_COST),
+    ))
+
+
+def aees_analytic(start: int, end: int, delta: int, flags: str = "") -> dict[str, Any] | None:
+    """Solves AEES exactly when `flags` is `-a`, otherwise returns :class:`None`"""
+    return _analytic("AEES", static.WINDIA_AEES_BASE_RATE, static.WINDIA_AEES_MIN_RATE, start, end, delta, flags, (
+        ("Meso", static.WINDIA_EES_MESO_COST),
+        ("COGs", static.WINDIA_AEES_COG_COST),
+        ("EES", static.WINDIA_AEES_EES_COST),
+    ))
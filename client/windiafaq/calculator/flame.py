@@ -0,0 +1,83 @@
+"""A lookup table of flame stat ranges
+
+The ranges only depend on the item level, so they are built once for every
+level up to :data:`static.WINDIA_FLAME_MAX_LEVEL` and `$flame` is answered
+from the table instead of the calculator server
+"""
+from typing import Any
+import functools
+
+import numpy as np
+
+from windiafaq import static
+from windiafaq.utils import format_float
+
+
+__all__ = ["table", "flame"]
+
+
+def _version() -> tuple:
+    return (
+        static.WINDIA_CALCULATOR_TABLE_VERSION,
+        static.WINDIA_FLAME_MAX_LEVEL,
+        static.WINDIA_FLAME_OVERALL_MULTIPLIER,
+        static.WINDIA_FLAME_EFLAME_MIN_RANGE,
+        static.WINDIA_FLAME_EFLAME_MAX_RANGE,
+        static.WINDIA_FLAME_PFLAME_MIN_RANGE,
+        static.WINDIA_FLAME_PFLAME_MAX_RANGE,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _table(version: tuple) -> list[tuple[float, ...]]:
+    _, max_level, overall_multiplier, *ranges = version
+
+    level = np.arange(max_level + 1, dtype=np.float64)
+    item = (np.floor(level / 20) + 1)[:, None] * ranges
+    overall = (np.floor(level * overall_multiplier / 20) + 1)[:, None] * ranges
+
+    return [tuple(row) for row in np.hstack((overall, item)).tolist()]
+
+
+def table() -> list[tuple[float, ...]]:
+    """The flame stat ranges of every level, rebuilt when the game constants change
+
+    Returns
+    -------
+    :class:`list`[:class:`tuple`[:class:`float`, ...]]
+        The overall eternal, overall powerful, item eternal and item powerful
+        min/max ranges, indexed by item level
+    """
+    return _table(_version())
+
+
+def flame(level: int) -> dict[str, Any] | None:
+    """Builds the payload the server replies to `flame` with
+
+    Returns :class:`None` for levels outside of the table, which are left to
+    the server
+    """
+    rows = table()
+    if not 0 <= level < len(rows):
+        return None
+
+    overall_e_min, overall_e_max, overall_p_min, overall_p_max, e_min, e_max, p_min, p_max = map(format_float, rows[level])
+
+    return {
+        "embeds": [{
+            "title": "Flames Calculator",
+            "description": f"The flame stats for a level {format_float(float(level))} item. Overall stats are double that of normal items.",
+            "fields": [
+                {
+                    "name": "Eternal Flame Stat Range",
+                    "value": f"Overall: {overall_e_min} - {overall_e_max}\nNot Overall: {e_min} - {e_max}",
+                    "inline": True,
+                },
+                {
+                    "name": "Powerful Flame Stat Range",
+                    "value": f"Overall: {overall_p_min} - {overall_p_max}\nNot Overall: {p_min} - {p_max}",
+                    "inline": True,
+                },
+            ],
+        }],
+    }
@@ -0,0 +1,192 @@
+"""Item leveling calculations
+
+:func:`simulate` is a batched engine: every simulation of a batch is advanced
+one level at a time as a NumPy array, so the random pools of all simulations
+at a level are drawn at once
+
+:func:`exact` computes the exact distribution of a stat instead, by convolving
+the closed-form distribution of a level's stat gain level by level
+"""
+import functools
+
+import numpy as np
+
+
+__all__ = ["simulate", "Distribution", "exact", "report"]
+
+
+STAT_MODIFIER = 2.1
+ATTACK_MODIFIER = 4.2
+LIMIT = 10000
+RETRIES = 100
+
+
+def _max_result(base: np.ndarray, is_attack: bool) -> np.ndarray:
+    modifier = ATTACK_MODIFIER if is_attack else STAT_MODIFIER
+    return np.floor(1 + base / (modifier * 1.05)).astype(np.int64)
+
+
+def _rand_stat(rng: np.random.Generator, limit: np.ndarray) -> np.ndarray:
+    pool_size = (limit * (limit + 1) // 2) + limit
+    randomized = rng.integers(0, pool_size, endpoint=True) - limit
+
+    stat = 1 + np.floor((-1 + np.sqrt((8 * np.maximum(randomized, 0)) + 1)) / 2).astype(np.int64)
+    return np.where(randomized >= 0, stat, 0)
+
+
+def _calc_stat(rng: np.random.Generator, base: np.ndarray, is_attack: bool) -> np.ndarray:
+    limit = np.minimum(_max_result(base, is_attack), LIMIT)
+
+    result = np.zeros_like(base)
+    pending = base > 0
+
+    # a stat gain of 0 is rerolled, up to RETRIES times
+    for _ in range(RETRIES):
+        if not pending.any():
+            break
+
+        result[pending] = _rand_stat(rng, limit[pending])
+        pending &= result == 0
+
+    return result
+
+
+def simulate(base: int, is_attack: bool, level_until: int = 7, simulations: int = 1, rng: np.random.Generator | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Simulates leveling an item from level 1 to `level_until`
+
+    Parameters
+    ----------
+    base : :class:`int`
+        The stat at level 1
+
+    is_attack : :class:`bool`
+        Whether or not the stat is attack
+
+    level_until : :class:`int`
+        The level to simulate until
+
+    simulations : :class:`int`
+        The amount of simulations to run
+
+    rng : :class:`np.random.Generator`
+        The random generator to draw from
+    Returns
+    -------
+    :class:`tuple`[:class:`np.ndarray`, :class:`np.ndarray`]
+        The stat gained and the upper bound of the stat gain on each level,
+        both shaped (simulations, level_until - 1)
+    """
+    rng = rng or np.random.default_rng()
+
+    stats = np.full(simulations, base, dtype=np.int64)
+    gains = np.zeros((simulations, level_until - 1), dtype=np.int64)
+    maxima = np.zeros((simulations, level_until - 1), dtype=np.int64)
+
+    for level in range(level_until - 1):
+        maxima[:, level] = np.where(stats > 0, _max_result(stats, is_attack) + 1, 0)
+        gains[:, level] = _calc_stat(rng, stats, is_attack)
+        stats += gains[:, level]
+
+    return gains, maxima
+
+
+class Distribution:
+    """The exact distribution of a stat
+
+    Attributes
+    ----------
+    offset : :class:`int`
+        The lowest stat of the distribution
+
+    probabilities : :class:`np.ndarray`
+        The probability of each stat, starting at `offset`
+    """
+    def __init__(self, offset: int, probabilities: np.ndarray) -> None:
+        self.offset = offset
+        self.probabilities = probabilities
+        self._cumulative = np.cumsum(probabilities)
+
+    @property
+    def mean(self) -> float:
+        return self.offset + float(np.dot(np.arange(len(self.probabilities)), self.probabilities))
+
+    @property
+    def maximum(self) -> int:
+        # the highest stat is always reachable by rolling the upper bound on every level
+        return self.offset + len(self.probabilities) - 1
+
+    def percentile(self, q: float) -> int:
+        """The lowest stat reached with a probability of at least `q` percent"""
+        index = np.searchsorted(self._cumulative, q / 100 * self._cumulative[-1])
+        return self.offset + int(min(index, len(self.probabilities) - 1))
+
+
+def _level_up(distribution: Distribution, is_attack: bool) -> Distribution:
+    stats = distribution.offset + np.arange(len(distribution.probabilities))
+    limits = np.where(stats > 0, np.minimum(_max_result(stats, is_attack), LIMIT), 0)
+
+    pool_sizes = (limits * (limits + 1) // 2) + limits + 1
+    zeros = limits / pool_sizes
+    rerolled = np.where(limits > 0, (1 - zeros ** RETRIES) / np.where(limits > 0, 1 - zeros, 1), 0)
+
+    # P(gain = k) is k * weight for 1 <= k <= limit and weight for limit + 1
+    weights = distribution.probabilities * rerolled / pool_sizes
+    index = np.arange(len(stats))
+    size = len(stats) + int(limits.max()) + 3
+
+    # every stat adds a ramp over its gains, which is built from its second differences
+    ramps = np.zeros(size)
+    np.add.at(ramps, index + 1, weights)
+    np.add.at(ramps, index + limits + 1, -weights * (limits + 1))
+    np.add.at(ramps, index + limits + 2, weights * limits)
+    probabilities = np.cumsum(np.cumsum(ramps))
+
+    np.add.at(probabilities, index + limits + 1, np.where(limits > 0, weights, 0))
+    probabilities[:len(stats)] += distribution.probabilities * np.where(limits > 0, zeros ** RETRIES, 1)
+
+    probabilities = np.clip(probabilities[:len(stats) + int(limits[-1]) + (1 if limits[-1] else 0)], 0, None)
+    return Distribution(distribution.offset, probabilities)
+
+
+@functools.lru_cache(maxsize=256)
+def exact(base: int, is_attack: bool, level_until: int = 7) -> Distribution:
+    """Computes the exact distribution of a stat at `level_until`
+
+    Parameters
+    ----------
+    base : :class:`int`
+        The stat at level 1
+
+    is_attack : :class:`bool`
+        Whether or not the stat is attack
+
+    level_until : :class:`int`
+        The level to compute the distribution at
+    Returns
+    -------
+    :class:`Distribution`
+        The distribution of the stat at `level_until`
+    """
+    if level_until <= 1:
+        return Distribution(base, np.ones(1))
+
+    return _level_up(exact(base, is_attack, level_until - 1), is_attack)
+
+
+def report(main_stat: int, attack: int) -> tuple[Distribution, Distribution, Distribution, Distribution, tuple[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]:
+    """Computes everything `$leveling` shows, so it can be run as one job
+
+    Returns
+    -------
+    :class:`tuple`
+        The exact stat and attack distributions at levels 5 and 7, followed by
+        one simulated path to level 7 of the stat and of the attack
+    """
+    return (
+        exact(main_stat, False, 5),
+        exact(attack, True, 5),
+        exact(main_stat, False, 7),
+        exact(attack, True, 7),
+        simulate(main_stat, False, 7),
+        simulate(attack, True, 7),
+    )
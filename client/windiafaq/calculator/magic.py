@@ -0,0 +1,160 @@
+"""Lookup tables of the magic needed to one shot a monster
+
+A spell one shots a monster once `modifier * (A * magic^2 + B * magic)`
+reaches its HP, so the HP one shot per point of modifier is tabled once for
+every amount of magic up to :data:`static.WINDIA_MAGIC_MAX_MAGIC`. `$magic`
+is then a binary search of `hp / modifier` in that table for the modifier of
+each class instead of a call to the calculator server
+"""
+from typing import Any, NamedTuple
+import functools
+
+import numpy as np
+
+from windiafaq import static
+from windiafaq.utils import format_float
+
+
+__all__ = ["Flags", "parse_flags", "table", "magic"]
+
+
+# the coefficients of the damage formula used by the server
+_A = 0.0000333333
+_B = 0.023
+
+
+class Flags(NamedTuple):
+    has_adv: bool = False
+    has_disadv: bool = False
+    has_staff: bool = False
+
+
+def parse_flags(flags: str) -> Flags:
+    """Parses `$magic` flags the way the server does
+
+    Raises
+    ------
+    :class:`ValueError`
+        The flags are invalid, with the message the server replies with
+    """
+    has_adv = has_disadv = has_staff = False
+
+    if flags.startswith("-"):
+        flags = flags[1:]
+
+    if " " in flags:
+        raise ValueError("Flags cannot contain spaces (ex. -es instead of -e -s)")
+
+    for flag in flags:
+        match flag:
+            case "e":
+                if has_disadv:
+                    raise ValueError("Cannot have both elemental advantage and disadvantage")
+
+                has_adv = True
+            case "d":
+                if has_adv:
+                    raise ValueError("Cannot have both elemental advantage and disadvantage")
+
+                has_disadv = True
+            case "l" | "s":
+                if has_staff:
+                    raise ValueError("Cannot have two staves")
+
+                has_staff = True
+            case _:
+                raise ValueError(f"Unknown flag: {flag}")
+
+    return Flags(has_adv, has_disadv, has_staff)
+
+
+def _version() -> tuple:
+    return (
+        static.WINDIA_CALCULATOR_TABLE_VERSION,
+        static.WINDIA_MAGIC_MAX_MAGIC,
+        static.WINDIA_MAGIC_STAFF_MULTIPLIER,
+        static.WINDIA_MAGIC_ELEMENTAL_ADVANTAGE_MULTIPLIER,
+        static.WINDIA_MAGIC_ELEMENTAL_DISADVANTAGE_MULTIPLIER,
+        static.WINDIA_MAGIC_BW_ELEMENTAL_AMP_MULTIPLIER,
+        static.WINDIA_MAGIC_FPIL_ELEMENTAL_AMP_MULTIPLIER,
+    )
+
+
+def _modifiers(spell_attack: float, flags: Flags) -> list[float]:
+    # same order of operations as the server, so the results round the same
+    modifier = spell_attack
+    if flags.has_adv:
+        modifier *= static.WINDIA_MAGIC_ELEMENTAL_ADVANTAGE_MULTIPLIER
+    elif flags.has_disadv:
+        modifier *= static.WINDIA_MAGIC_ELEMENTAL_DISADVANTAGE_MULTIPLIER
+
+    if flags.has_staff:
+        modifier *= static.WINDIA_MAGIC_STAFF_MULTIPLIER
+
+    return [
+        modifier * static.WINDIA_MAGIC_BW_ELEMENTAL_AMP_MULTIPLIER,
+        modifier * static.WINDIA_MAGIC_FPIL_ELEMENTAL_AMP_MULTIPLIER,
+        modifier,
+    ]
+
+
+@functools.lru_cache(maxsize=1)
+def _table(version: tuple) -> np.ndarray:
+    magic = np.arange(version[1] + 1, dtype=np.float64)
+    return _A * magic * magic + _B * magic
+
+
+def table() -> np.ndarray:
+    """The HP one shot per point of modifier, rebuilt when the game constants change
+
+    Returns
+    -------
+    :class:`np.ndarray`
+        The HP indexed by magic
+    """
+    return _table(_version())
+
+
+def magic(hp: int, spell_attack: int, flags: str = "") -> dict[str, Any] | None:
+    """Builds the payload the server replies to `magic` with
+
+    Returns :class:`None` for non-positive values or monsters needing more
+    magic than the table holds, which are left to the server
+    """
+    try:
+        parsed = parse_flags(flags)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    if hp <= 0 or spell_attack <= 0:
+        return None
+
+    damage = table()
+    needed = [int(np.searchsorted(damage, hp / modifier)) for modifier in _modifiers(float(spell_attack), parsed)]
+    if max(needed) >= len(damage):
+        return None
+
+    description = (
+        f"The magic required to one-shot a monster with {format_float(float(hp))} HP and {format_float(float(spell_attack))} spell attack with modifiers:\n\n"
+        f"BW Elemental Amp: {format_float(static.WINDIA_MAGIC_BW_ELEMENTAL_AMP_MULTIPLIER)}x\n"
+        f"FP/IL Elemental Amp: {format_float(static.WINDIA_MAGIC_FPIL_ELEMENTAL_AMP_MULTIPLIER)}x\n"
+    )
+
+    if parsed.has_adv:
+        description += f"Elemental Advantage: {format_float(static.WINDIA_MAGIC_ELEMENTAL_ADVANTAGE_MULTIPLIER)}x\n"
+    elif parsed.has_disadv:
+        description += f"Elemental Disadvantage: {format_float(static.WINDIA_MAGIC_ELEMENTAL_DISADVANTAGE_MULTIPLIER)}x\n"
+
+    if parsed.has_staff:
+        description += f"Staff Multiplier: {format_float(static.WINDIA_MAGIC_STAFF_MULTIPLIER)}x\n"
+
+    return {
+        "embeds": [{
+            "title": "Magic Calculator",
+            "description": description,
+            "fields": [
+                {"name": "Class", "value": "BW\nFP/IL\nBS", "inline": True},
+                {"name": "Magic", "value": "\n".join(map(str, needed)), "inline": True},
+            ],
+        }],
+    }
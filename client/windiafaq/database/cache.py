@@ -0,0 +1,345 @@
+from typing import Iterable
+import bisect
+import math
+import threading
+
+from windiafaq import static, utils
+from windiafaq.database.search import SearchIndex
+from windiafaq.database.suggest import TrigramIndex
+from windiafaq.database.trie import PrefixTrie
+from windiafaq.database.types import Alias, Command
+
+
+__all__ = ["FAQCache"]
+
+
+def _document(command: Command) -> str:
+    # the name is indexed with the description so a search for it ranks it first
+    return f"{command.command} {command.description}"
+
+
+class FAQCache:
+    """A resident in-memory copy of every FAQ command and alias
+
+    The cache is filled once by :meth:`load` and then kept current by the
+    writes done through :class:`FAQDatabase`, so lookups never leave the process
+
+    Attributes
+    ----------
+    search : :class:`SearchIndex`
+        A full-text index over the names and descriptions of the visible commands
+
+    trigrams : :class:`TrigramIndex`
+        An index of every command and alias name for suggesting near misses
+
+    completions : :class:`PrefixTrie`
+        A prefix tree of the visible command and alias names for autocomplete
+
+    hits : :class:`int`
+        The amount of user lookups that resolved to a command or alias
+
+    misses : :class:`int`
+        The amount of user lookups that did not resolve to anything
+    """
+    def __init__(self) -> None:
+        self._commands: dict[str, Command] = {}
+        self._aliases: dict[str, Alias] = {}
+
+        # denormalized name -> command index, so an alias resolves in one lookup
+        self._index: dict[str, Command] = {}
+        self._aliases_by_command: dict[str, set[str]] = {}
+        self._names: frozenset[str] | None = None
+
+        # names of the visible commands kept sorted, and the pages rendered from them
+        self._visible: list[str] = []
+        self._pages: dict[tuple[int, int], str] = {}
+        self._lock = threading.Lock()
+
+        self.search = SearchIndex()
+        self.trigrams = TrigramIndex()
+        self.completions = PrefixTrie()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, commands: Iterable[Command], aliases: Iterable[Alias]) -> None:
+        """Replaces the contents of the cache
+
+        Parameters
+        ----------
+        commands : :class:`Iterable`[:class:`Command`]
+            Every command in the database
+
+        aliases : :class:`Iterable`[:class:`Alias`]
+            Every alias in the database
+        """
+        commands = {command.command: command for command in commands}
+        aliases = {alias.alias: alias for alias in aliases}
+
+        index = dict(commands)
+        aliases_by_command: dict[str, set[str]] = {}
+        for alias in aliases.values():
+            aliases_by_command.setdefault(alias.command, set()).add(alias.alias)
+            if alias.alias not in commands and alias.command in commands:
+                index[alias.alias] = commands[alias.command]
+
+        visible = sorted(command.command for command in commands.values() if not command.hidden)
+
+        with self._lock:
+            self._commands, self._aliases = commands, aliases
+            self._index, self._aliases_by_command = index, aliases_by_command
+            self._visible = visible
+            self._pages.clear()
+            self._names = None
+
+            self.trigrams.clear()
+            for name in index:
+                self.trigrams.add(name)
+
+            self.completions.clear()
+            for name, command in index.items():
+                if self._is_visible(name, command, aliases.get(name)):
+                    self.completions.add(name)
+
+            self.search.clear()
+            for command in commands.values():
+                if not command.hidden:
+                    self.search.add(command.command, _document(command))
+
+    def dump(self) -> tuple[list[Command], list[Alias]]:
+        """A consistent copy of every command and alias, for writing a snapshot"""
+        with self._lock:
+            return list(self._commands.values()), list(self._aliases.values())
+
+    @property
+    def commands(self) -> list[Command]:
+        return list(self._commands.values())
+
+    @property
+    def aliases(self) -> list[Alias]:
+        return list(self._aliases.values())
+
+    @property
+    def names(self) -> frozenset[str]:
+        """A snapshot of every command and alias name, rebuilt after a write"""
+        if (names := self._names) is None:
+            names = self._names = frozenset(self._index)
+
+        return names
+
+    @property
+    def visible(self) -> list[str]:
+        """The names of every command that is not hidden, in sorted order"""
+        with self._lock:
+            return list(self._visible)
+
+    def page_count(self, size: int) -> int:
+        with self._lock:
+            return max(math.ceil(len(self._visible) / size), 1)
+
+    def page(self, number: int, size: int) -> str:
+        """Renders one page of the visible commands in columns
+
+        Pages are rendered on first request and kept until the visible
+        commands change. A page is rendered under the lock, so one rendered
+        from commands a write has just changed is never kept
+
+        Parameters
+        ----------
+        number : :class:`int`
+            The zero-based number of the page
+
+        size : :class:`int`
+            The amount of commands on a page
+        Returns
+        -------
+        :class:`str`
+            The commands on the page in columns
+        """
+        key = (number, size)
+        if (page := self._pages.get(key)) is not None:
+            return page
+
+        with self._lock:
+            if (page := self._pages.get(key)) is None:
+                page = self._pages[key] = utils.make_columns(self._visible[number*size:(number+1)*size])
+
+            return page
+
+    def is_command(self, name: str) -> bool:
+        """Whether or not a name belongs to a command rather than an alias"""
+        return name in self._commands
+
+    def __contains__(self, command_or_alias: str) -> bool:
+        return command_or_alias in self.names
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+    def get_command(self, command_or_alias: str) -> Command | None:
+        """Gets a command by its name or alias
+
+        Parameters
+        ----------
+        command_or_alias : :class:`str`
+            The command or alias of a command to get a command by
+        Returns
+        -------
+        :class:`Command`
+            If found, the command object of the command
+        :class:`None`
+            If the command wasn't found
+        """
+        command = self._index.get(command_or_alias)
+
+        if command is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return command
+
+    def peek(self, command_or_alias: str) -> Command | None:
+        """Gets a command by its name or alias like :meth:`get_command`, without
+        counting a hit or miss, for lookups the bot makes on its own behalf"""
+        return self._index.get(command_or_alias)
+
+    def suggest(self, word: str) -> list[str]:
+        """Suggests command and alias names close to a word that did not match one
+
+        Names of hidden commands and aliases are never suggested
+
+        Parameters
+        ----------
+        word : :class:`str`
+            The name that was not found
+        Returns
+        -------
+        :class:`list`[:class:`str`]
+            The closest visible names, closest first
+        """
+        suggestions = [
+            name for name in self.trigrams.suggest(word, limit=static.FAQ_SUGGEST_CANDIDATES)
+            if self._is_visible(name, self._index.get(name), self._aliases.get(name))
+        ]
+
+        return suggestions[:static.FAQ_SUGGEST_LIMIT]
+
+    def get_alias(self, alias: str) -> Alias | None:
+        """Gets an alias by its name
+
+        Parameters
+        ----------
+        alias : :class:`str`
+            The invoke or title of the alias
+        Returns
+        -------
+        :class:`Alias`
+            If found, the alias object of the alias
+        :class:`None`
+            If the alias wasn't found
+        """
+        return self._aliases.get(alias)
+
+    def put_command(self, command: Command) -> None:
+        with self._lock:
+            self._put_command(command)
+
+    def update_command(self, command: str, description: str) -> None:
+        with self._lock:
+            if cmd := self._commands.get(command):
+                self._put_command(Command(command, description, hidden=cmd.hidden))
+
+    def remove_command(self, command: str) -> None:
+        """Removes a command and all aliases associated with it"""
+        with self._lock:
+            if (cmd := self._commands.pop(command, None)) and not cmd.hidden:
+                self._remove_visible(command)
+                self.search.remove(command)
+
+            self._index.pop(command, None)
+            self.trigrams.remove(command)
+            self.completions.remove(command)
+            self._names = None
+
+            for alias in self._aliases_by_command.pop(command, ()):
+                self._aliases.pop(alias, None)
+                self._index.pop(alias, None)
+                self.trigrams.remove(alias)
+                self.completions.remove(alias)
+
+    def put_alias(self, alias: Alias) -> None:
+        with self._lock:
+            self._remove_alias(alias.alias)
+            self._names = None
+
+            self._aliases[alias.alias] = alias
+            self._aliases_by_command.setdefault(alias.command, set()).add(alias.alias)
+            if alias.alias not in self._commands and (command := self._commands.get(alias.command)):
+                self._index[alias.alias] = command
+                self.trigrams.add(alias.alias)
+                if self._is_visible(alias.alias, command, alias):
+                    self.completions.add(alias.alias)
+
+    def remove_alias(self, alias: str) -> None:
+        with self._lock:
+            self._remove_alias(alias)
+            self._names = None
+
+    def _put_command(self, command: Command) -> None:
+        if command.command not in self._index:
+            self._names = None
+
+        was_visible = (cmd := self._commands.get(command.command)) is not None and not cmd.hidden
+        if was_visible and command.hidden:
+            self._remove_visible(command.command)
+        elif not was_visible and not command.hidden:
+            bisect.insort(self._visible, command.command)
+            self._pages.clear()
+
+        self._commands[command.command] = command
+        self._index[command.command] = command
+        self.trigrams.add(command.command)
+        self._complete(command.command, command)
+
+        if command.hidden:
+            self.search.remove(command.command)
+        else:
+            self.search.add(command.command, _document(command))
+
+        for alias in self._aliases_by_command.get(command.command, ()):
+            if alias not in self._commands:
+                self._index[alias] = command
+                self.trigrams.add(alias)
+                self._complete(alias, command)
+
+    def _remove_alias(self, alias: str) -> None:
+        if (al := self._aliases.pop(alias, None)) is None:
+            return
+
+        self._aliases_by_command.get(al.command, set()).discard(alias)
+        if alias not in self._commands:
+            self._index.pop(alias, None)
+            self.trigrams.remove(alias)
+            self.completions.remove(alias)
+
+    @staticmethod
+    def _is_visible(name: str, command: Command | None, alias: Alias | None) -> bool:
+        if command is None or command.hidden:
+            return False
+
+        # a command shadows an alias of the same name
+        return name == command.command or alias is None or not alias.hidden
+
+    def _complete(self, name: str, command: Command) -> None:
+        if self._is_visible(name, command, self._aliases.get(name)):
+            self.completions.add(name)
+        else:
+            self.completions.remove(name)
+
+    def _remove_visible(self, command: str) -> None:
+        i = bisect.bisect_left(self._visible, command)
+        if i < len(self._visible) and self._visible[i] == command:
+            del self._visible[i]
+            self._pages.clear()
@@ -1,14 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, IO
+import asyncio
+import functools
 import os
+import time
 
+from loguru import logger
 from typing_extensions import Self
-from pymongo.errors import DuplicateKeyError
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
 from pymongo.mongo_client import MongoClient
+from pymongo.operations import ReplaceOne
 
 from windiafaq import static
+from windiafaq.database.cache import FAQCache
+from windiafaq.database.snapshot import SnapshotError, read_snapshot, write_snapshot
+from windiafaq.database.transfer import ImportResult, dump_section
 from windiafaq.database.types import Alias, Command
+from windiafaq.metrics import FAQ_LOOKUP_SECONDS, MONGO_ERRORS, MONGO_SECONDS
 
 
-__all__ = ["FAQDatabase"]
+__all__ = ["FAQDatabase", "AsyncFAQDatabase"]
+
+
+def _instrumented(func: Callable[..., Any]) -> Callable[..., Any]:
+    # times every call of a method that reaches Mongo and counts its failures
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        with MONGO_SECONDS.time(operation=func.__name__):
+            try:
+                return func(*args, **kwargs)
+            except PyMongoError:
+                MONGO_ERRORS.inc(operation=func.__name__)
+                raise
+
+    return wrapper
 
 
 class FAQDatabase:
@@ -19,20 +45,53 @@ class FAQDatabase:
         self._commands = _db.get_collection(static.MONGO_COLLECTION_COMMANDS)
         self._aliases = _db.get_collection(static.MONGO_COLLECTION_ALIASES)
 
+        self.cache = FAQCache()
+
+    @_instrumented
+    def reload(self) -> None:
+        """Loads every command and alias from the database into the cache"""
+        with self._commands.find() as commands_documents:
+            commands = [Command.from_document(document) for document in commands_documents]
+
+        with self._aliases.find() as aliases_documents:
+            aliases = [Alias.from_document(document) for document in aliases_documents]
+
+        self.cache.load(commands, aliases)
+        self.save_snapshot()
+
+    def load_snapshot(self) -> bool:
+        """Loads the cache from the on-disk snapshot, without reaching Mongo
+
+        Returns
+        -------
+        :class:`bool`
+            Whether or not a valid snapshot was loaded
+        """
+        try:
+            commands, aliases = read_snapshot(static.FAQ_SNAPSHOT_PATH)
+        except SnapshotError as e:
+            logger.warning("FAQ snapshot not loaded: {}", e)
+            return False
+
+        self.cache.load(commands, aliases)
+        return True
+
+    def save_snapshot(self) -> None:
+        """Writes the cache to the on-disk snapshot"""
+        try:
+            write_snapshot(static.FAQ_SNAPSHOT_PATH, *self.cache.dump())
+        except OSError:
+            logger.opt(exception=True).warning("could not write FAQ snapshot")
+
     def get_all(self) -> list[str]:
-        """Gets all commands and aliases
+        """Gets all commands that are not hidden
         
         Returns
         -------
         :class:`list`[:class:`str`]
-            A list of the commands and aliases by their string identifiers, 
-            `command` for command and `alias` for alias
+            A sorted list of the commands by their string identifiers
         """
-        with self._commands.find() as commands_documents:
-            commands = [document["_id"] for document in commands_documents if not document.get("hidden", False)]
-            commands_documents.close()
-
-            return commands
+        return self.cache.visible
 
     def get_command(self, command_or_alias: str) -> Command | None:
         """Gets a command by its name or alias
@@ -48,13 +107,52 @@ class FAQDatabase:
         :class:`None`
             If the command wasn't found
         """
-        document = self._commands.find_one({"_id": command_or_alias})
-        if document is None:
-            if alias := self.get_alias(command_or_alias):
-                document = self._commands.find_one({"_id": alias.command})
+        start = time.perf_counter()
+        command = self.cache.get_command(command_or_alias)
+        FAQ_LOOKUP_SECONDS.observe(time.perf_counter() - start, source="cache", result="hit" if command else "miss")
+        return command
+
+    @_instrumented
+    def fetch_command(self, command_or_alias: str) -> Command | None:
+        """Gets a command by its name or alias straight from the database,
+        bypassing the cache
+
+        The command and alias collections are searched in a single aggregation,
+        so an alias is resolved in one round trip
+        
+        Parameters
+        ----------
+        command_or_alias : :class:`str`
+            The command or alias of a command to get a command by
+        Returns
+        -------
+        :class:`Command`
+            If found, the command object of the command
+        :class:`None`
+            If the command wasn't found
+        """
+        pipeline = [
+            {"$match": {"_id": command_or_alias}},
+            {"$unionWith": {
+                "coll": static.MONGO_COLLECTION_ALIASES,
+                "pipeline": [
+                    {"$match": {"_id": command_or_alias}},
+                    {"$lookup": {"from": static.MONGO_COLLECTION_COMMANDS, "localField": "command", "foreignField": "_id", "as": "command"}},
+                    {"$unwind": "$command"},
+                    {"$replaceRoot": {"newRoot": "$command"}},
+                ],
+            }},
+            {"$limit": 1},
+        ]
+
+        start = time.perf_counter()
+        with self._commands.aggregate(pipeline) as documents:
+            document = next(documents, None)
 
+        FAQ_LOOKUP_SECONDS.observe(time.perf_counter() - start, source="db", result="hit" if document else "miss")
         return Command.from_document(document) if document else None
 
+    @_instrumented
     def add_command(self, command: str, description: str, *, hidden=False) -> bool:
         """Adds a command to the database
         
@@ -78,10 +176,13 @@ class FAQDatabase:
 
         try:
             self._commands.insert_one(cmd.to_document())
-            return True
         except DuplicateKeyError:
             return False
 
+        self.cache.put_command(cmd)
+        return True
+
+    @_instrumented
     def update_command(self, command: str, description: str) -> bool:
         """Updates a command in the database
         
@@ -98,8 +199,12 @@ class FAQDatabase:
             Whether or not the update was successful    
         """
         result = self._commands.update_one({"_id": command}, {"$set": {"description": description}})
-        return result.matched_count > 0
+        if updated := result.matched_count > 0:
+            self.cache.update_command(command, description)
+
+        return updated
 
+    @_instrumented
     def delete_command(self, command: str) -> bool:
         """Deletes a command from the database
         
@@ -116,6 +221,7 @@ class FAQDatabase:
         if deleted := result.deleted_count > 0:
             # delete all aliases associated with the command
             self._aliases.delete_many({"command": command})
+            self.cache.remove_command(command)
 
         return deleted
 
@@ -133,9 +239,9 @@ class FAQDatabase:
         :class:`None`
             If the alias wasn't found
         """
-        document = self._aliases.find_one({"_id": alias})
-        return Alias.from_document(document) if document else None
+        return self.cache.get_alias(alias)
 
+    @_instrumented
     def add_alias(self, alias: str, command: str) -> bool:
         """Adds an alias to the database
         
@@ -151,18 +257,21 @@ class FAQDatabase:
         :class:`bool`
             Whether or not the add was successful    
         """
-        if not self.get_command(command):
+        if not (cmd := self.cache.peek(command)):
             # no duplicate keys with commands
             return False
 
-        al = Alias(alias, command)
+        al = Alias(alias, cmd.command)
 
         try:
             self._aliases.insert_one(al.to_document())
-            return True
         except DuplicateKeyError:
             return False
 
+        self.cache.put_alias(al)
+        return True
+
+    @_instrumented
     def delete_alias(self, alias: str) -> bool:
         """Deletes an alias from the database
         
@@ -176,8 +285,90 @@ class FAQDatabase:
             Whether or not the delete was successful    
         """
         result = self._aliases.delete_one({"_id": alias})
-        return result.deleted_count > 0
+        if deleted := result.deleted_count > 0:
+            self.cache.remove_alias(alias)
+
+        return deleted
         
+    @_instrumented
+    def import_entries(self, commands: list[Command], aliases: list[Alias]) -> list[ImportResult]:
+        """Adds or replaces commands and aliases in bulk
+
+        Each collection is written with one ordered bulk write, commands
+        first. Aliases are skipped when any command failed, as they may point
+        at it. The writes are not a transaction, an import that fails part way
+        keeps every entry written before the one that failed
+
+        Parameters
+        ----------
+        commands : :class:`list`[:class:`Command`]
+            The validated commands to write
+
+        aliases : :class:`list`[:class:`Alias`]
+            The validated aliases to write, pointing at commands
+        Returns
+        -------
+        :class:`list`[:class:`ImportResult`]
+            What happened to every command and alias, in order
+        """
+        results = self._bulk_replace(self._commands, "command", commands, self.cache.put_command)
+
+        if any(result.status not in ("added", "updated") for result in results):
+            return results + [ImportResult("alias", alias.alias, "skipped") for alias in aliases]
+
+        return results + self._bulk_replace(self._aliases, "alias", aliases, self.cache.put_alias)
+
+    def _bulk_replace(self, collection: Collection, kind: str, entries: list[Command] | list[Alias], put: Callable[[Any], None]) -> list[ImportResult]:
+        if not entries:
+            return []
+
+        documents = [entry.to_document() for entry in entries]
+        requests = [ReplaceOne({"_id": document["_id"]}, document, upsert=True) for document in documents]
+
+        try:
+            upserted = collection.bulk_write(requests, ordered=True).upserted_ids
+            failed_at, error = len(entries), None
+        except BulkWriteError as e:
+            # an ordered bulk write stops at its first error
+            upserted = {upsert["index"]: upsert["_id"] for upsert in e.details["upserted"]}
+            failed_at, error = e.details["writeErrors"][0]["index"], e.details["writeErrors"][0]["errmsg"]
+
+        results = []
+        for i, document in enumerate(documents):
+            if i < failed_at:
+                put(entries[i])
+                status = "added" if i in upserted else "updated"
+            else:
+                status = f"failed: {error}" if i == failed_at else "skipped"
+
+            results.append(ImportResult(kind, document["_id"], status))
+
+        return results
+
+    @_instrumented
+    def export(self, fp: IO[bytes]) -> None:
+        """Streams every command and alias to a file as an import payload
+
+        Documents are read in batches of :data:`static.MONGO_EXPORT_BATCH_SIZE`
+        and written one at a time, so the collections are never held whole
+
+        Parameters
+        ----------
+        fp : :class:`IO`[:class:`bytes`]
+            The file to write to
+        """
+        with self._commands.find(batch_size=static.MONGO_EXPORT_BATCH_SIZE).sort("_id") as documents:
+            dump_section(fp, "commands", (
+                {"command": document["_id"], "description": document["description"], "hidden": document.get("hidden", False)}
+                for document in documents
+            ))
+
+        with self._aliases.find(batch_size=static.MONGO_EXPORT_BATCH_SIZE).sort("_id") as documents:
+            dump_section(fp, "aliases", (
+                {"alias": document["_id"], "command": document["command"]}
+                for document in documents
+            ))
+
     def disconnect(self) -> None:
         """Closes database connections"""
         return self._client.close()
@@ -186,4 +377,73 @@ class FAQDatabase:
         return self
 
     def __exit__(self, *_) -> None:
-        self.disconnect()
\ No newline at end of file
+        self.disconnect()
+
+
+class AsyncFAQDatabase:
+    """An awaitable wrapper around :class:`FAQDatabase`
+
+    Every call that reaches Mongo is run on a bounded thread pool so a slow query
+    never blocks the event loop, while cache-only lookups are answered in place
+
+    Attributes
+    ----------
+    sync : :class:`FAQDatabase`
+        The wrapped blocking database
+    """
+    def __init__(self, database: FAQDatabase | None = None, *, max_workers: int = static.MONGO_MAX_WORKERS):
+        self.sync = database or FAQDatabase()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mongo")
+
+    @property
+    def cache(self) -> FAQCache:
+        return self.sync.cache
+
+    async def _run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def reload(self) -> None:
+        return await self._run(self.sync.reload)
+
+    async def load_snapshot(self) -> bool:
+        return self.sync.load_snapshot()
+
+    async def get_all(self) -> list[str]:
+        return self.sync.get_all()
+
+    async def get_command(self, command_or_alias: str) -> Command | None:
+        return self.sync.get_command(command_or_alias)
+
+    async def fetch_command(self, command_or_alias: str) -> Command | None:
+        return await self._run(self.sync.fetch_command, command_or_alias)
+
+    async def add_command(self, command: str, description: str, *, hidden=False) -> bool:
+        return await self._run(self.sync.add_command, command, description, hidden=hidden)
+
+    async def update_command(self, command: str, description: str) -> bool:
+        return await self._run(self.sync.update_command, command, description)
+
+    async def delete_command(self, command: str) -> bool:
+        return await self._run(self.sync.delete_command, command)
+
+    async def get_alias(self, alias: str) -> Alias | None:
+        return self.sync.get_alias(alias)
+
+    async def add_alias(self, alias: str, command: str) -> bool:
+        return await self._run(self.sync.add_alias, alias, command)
+
+    async def delete_alias(self, alias: str) -> bool:
+        return await self._run(self.sync.delete_alias, alias)
+
+    async def import_entries(self, commands: list[Command], aliases: list[Alias]) -> list[ImportResult]:
+        return await self._run(self.sync.import_entries, commands, aliases)
+
+    async def export(self, fp: IO[bytes]) -> None:
+        return await self._run(self.sync.export, fp)
+
+    def disconnect(self) -> None:
+        """Saves the snapshot, closes database connections and stops the thread pool"""
+        self._executor.shutdown(wait=False)
+        self.sync.save_snapshot()
+        return self.sync.disconnect()
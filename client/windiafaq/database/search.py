@@ -0,0 +1,127 @@
+from collections import Counter
+import heapq
+import math
+import re
+import threading
+
+from windiafaq import static
+
+
+__all__ = ["tokenize", "SearchIndex"]
+
+
+_TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits text into lowercase alphanumeric terms"""
+    return _TOKEN_REGEX.findall(text.lower())
+
+
+class SearchIndex:
+    """An inverted index over FAQ commands ranked with BM25
+
+    Documents are added and removed one at a time, so the index is kept
+    current alongside the cache instead of being rebuilt
+
+    Attributes
+    ----------
+    k1 : :class:`float`
+        How quickly repeated terms stop raising a score
+
+    b : :class:`float`
+        How strongly long documents are penalized
+    """
+    def __init__(self, *, k1: float = static.FAQ_SEARCH_K1, b: float = static.FAQ_SEARCH_B) -> None:
+        self.k1 = k1
+        self.b = b
+
+        self._postings: dict[str, dict[str, int]] = {}
+        self._lengths: dict[str, int] = {}
+        self._terms: dict[str, tuple[str, ...]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._terms.clear()
+            self._total_length = 0
+
+    def add(self, name: str, text: str) -> None:
+        """Indexes a document, replacing any document with the same name
+
+        Parameters
+        ----------
+        name : :class:`str`
+            The name of the document
+
+        text : :class:`str`
+            The text to index the document by
+        """
+        terms = tokenize(text)
+        frequencies = Counter(terms)
+
+        with self._lock:
+            self._remove(name)
+
+            for term, frequency in frequencies.items():
+                self._postings.setdefault(term, {})[name] = frequency
+
+            self._lengths[name] = len(terms)
+            self._terms[name] = tuple(frequencies)
+            self._total_length += len(terms)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._remove(name)
+
+    def search(self, query: str, *, limit: int = static.FAQ_SEARCH_LIMIT) -> list[tuple[str, float]]:
+        """Ranks the documents containing any term of a query
+
+        Parameters
+        ----------
+        query : :class:`str`
+            The terms to search for
+
+        limit : :class:`int`
+            The most documents to return
+        Returns
+        -------
+        :class:`list`[:class:`tuple`[:class:`str`, :class:`float`]]
+            The names and scores of the best matching documents, best first
+        """
+        scores: dict[str, float] = {}
+
+        with self._lock:
+            if not self._lengths:
+                return []
+
+            documents = len(self._lengths)
+            average_length = self._total_length / documents
+
+            for term in set(tokenize(query)):
+                if not (postings := self._postings.get(term)):
+                    continue
+
+                idf = math.log(1 + (documents - len(postings) + .5) / (len(postings) + .5))
+                for name, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[name] / average_length)
+                    scores[name] = scores.get(name, 0.) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def _remove(self, name: str) -> None:
+        if (length := self._lengths.pop(name, None)) is None:
+            return
+
+        self._total_length -= length
+        for term in self._terms.pop(name):
+            postings = self._postings[term]
+            del postings[name]
+            if not postings:
+                del self._postings[term]
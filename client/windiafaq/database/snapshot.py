@@ -0,0 +1,106 @@
+"""A compact on-disk snapshot of the FAQ commands and aliases
+
+The file is a fixed header followed by a compact JSON payload::
+
+    magic (4 bytes) | version (u16) | crc32 of payload (u32) | payload length (u64) | payload
+
+It is read through a memory map and rejected whole when its magic, version,
+length or checksum do not match, so a torn or stale file never reaches the
+cache
+"""
+from pathlib import Path
+import json
+import mmap
+import os
+import struct
+import zlib
+
+from windiafaq import static
+from windiafaq.database.types import Alias, Command
+
+
+__all__ = ["SnapshotError", "read_snapshot", "write_snapshot"]
+
+
+_MAGIC = b"WFAQ"
+_HEADER = struct.Struct("<4sHIQ")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, corrupt or from another version"""
+
+
+def write_snapshot(path: Path, commands: list[Command], aliases: list[Alias]) -> None:
+    """Writes a snapshot, replacing the old one atomically
+
+    Parameters
+    ----------
+    path : :class:`Path`
+        Where to write the snapshot
+
+    commands : :class:`list`[:class:`Command`]
+        Every command to keep
+
+    aliases : :class:`list`[:class:`Alias`]
+        Every alias to keep
+    """
+    payload = json.dumps({
+        "commands": [[command.command, command.description, command.hidden] for command in commands],
+        "aliases": [[alias.alias, alias.command, alias.hidden] for alias in aliases],
+    }, separators=(",", ":")).encode()
+
+    header = _HEADER.pack(_MAGIC, static.FAQ_SNAPSHOT_VERSION, zlib.crc32(payload), len(payload))
+
+    temporary = path.with_name(f"{path.name}.tmp")
+    with open(temporary, "wb") as f:
+        f.write(header)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(temporary, path)
+
+
+def read_snapshot(path: Path) -> tuple[list[Command], list[Alias]]:
+    """Reads a snapshot written by :func:`write_snapshot`
+
+    Parameters
+    ----------
+    path : :class:`Path`
+        Where the snapshot was written
+    Returns
+    -------
+    :class:`tuple`[:class:`list`[:class:`Command`], :class:`list`[:class:`Alias`]]
+        The commands and aliases in the snapshot
+    Raises
+    ------
+    :class:`SnapshotError`
+        The snapshot is missing, corrupt or from another version
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < _HEADER.size:
+                raise SnapshotError(f"snapshot is truncated: {path}")
+
+            magic, version, checksum, length = _HEADER.unpack_from(mm)
+            if magic != _MAGIC:
+                raise SnapshotError(f"not a snapshot: {path}")
+
+            if version != static.FAQ_SNAPSHOT_VERSION:
+                raise SnapshotError(f"snapshot version {version} is not {static.FAQ_SNAPSHOT_VERSION}: {path}")
+
+            if len(mm) != _HEADER.size + length:
+                raise SnapshotError(f"snapshot is truncated: {path}")
+
+            payload = mm[_HEADER.size:]
+    except (OSError, ValueError) as e:
+        # mmap raises ValueError for an empty file
+        raise SnapshotError(f"could not read snapshot: {path}") from e
+
+    if zlib.crc32(payload) != checksum:
+        raise SnapshotError(f"snapshot checksum does not match: {path}")
+
+    data = json.loads(payload)
+    commands = [Command(command, description, hidden=hidden) for command, description, hidden in data["commands"]]
+    aliases = [Alias(alias, command, hidden=hidden) for alias, command, hidden in data["aliases"]]
+    return commands, aliases
@@ -0,0 +1,104 @@
+import heapq
+import threading
+
+from windiafaq import static
+
+
+__all__ = ["trigrams", "edit_distance", "TrigramIndex"]
+
+
+def trigrams(word: str) -> set[str]:
+    """The trigrams of a word, padded so short words and word edges count"""
+    padded = f"  {word} "
+    return {padded[i:i+3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """The Levenshtein distance between two words, or `limit + 1` once it is known to exceed `limit`"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+
+        if min(current) > limit:
+            return limit + 1
+
+        previous = current
+
+    return min(previous[-1], limit + 1)
+
+
+class TrigramIndex:
+    """An index of names by their trigrams for finding near misses
+
+    Candidates are the names sharing the most trigrams with a word, and only
+    those are checked by edit distance, so a lookup never scans every name
+    """
+    def __init__(self) -> None:
+        self._postings: dict[str, set[str]] = {}
+        self._names: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._names.clear()
+
+    def add(self, name: str) -> None:
+        with self._lock:
+            if name in self._names:
+                return
+
+            self._names.add(name)
+            for trigram in trigrams(name):
+                self._postings.setdefault(trigram, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            if name not in self._names:
+                return
+
+            self._names.discard(name)
+            for trigram in trigrams(name):
+                postings = self._postings[trigram]
+                postings.discard(name)
+                if not postings:
+                    del self._postings[trigram]
+
+    def suggest(self, word: str, *, limit: int = static.FAQ_SUGGEST_LIMIT, max_distance: int = static.FAQ_SUGGEST_MAX_DISTANCE) -> list[str]:
+        """Finds the names closest to a word
+
+        Parameters
+        ----------
+        word : :class:`str`
+            The word to find names close to
+
+        limit : :class:`int`
+            The most names to return
+
+        max_distance : :class:`int`
+            The largest edit distance a name may be from the word, lowered for
+            short words so they don't match everything
+        Returns
+        -------
+        :class:`list`[:class:`str`]
+            The closest names, closest first
+        """
+        max_distance = min(max_distance, max(len(word) // 3, 1))
+        shared: dict[str, int] = {}
+
+        with self._lock:
+            for trigram in trigrams(word):
+                for name in self._postings.get(trigram, ()):
+                    shared[name] = shared.get(name, 0) + 1
+
+        candidates = heapq.nlargest(static.FAQ_SUGGEST_CANDIDATES, shared, key=shared.__getitem__)
+        distances = ((edit_distance(word, name, max_distance), name) for name in candidates)
+        return [name for _, name in sorted(d for d in distances if d[0] <= max_distance)[:limit]]
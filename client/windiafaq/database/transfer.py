@@ -0,0 +1,193 @@
+"""Parsing, validation and formatting of bulk FAQ imports and exports
+
+A payload is YAML (or JSON, which YAML reads too) of the form::
+
+    commands:
+    - command: example
+      description: this is an example
+      hidden: false
+    aliases:
+    - alias: ex
+      command: example
+
+The whole payload is validated in memory before anything is written, so an
+invalid payload writes nothing. The write itself is not atomic, it stops at
+the first entry Mongo refuses and keeps the entries written before it, see
+:meth:`FAQDatabase.import_entries <windiafaq.database.database.FAQDatabase.import_entries>`
+"""
+from typing import Any, IO, Iterable, NamedTuple
+
+import yaml
+
+from windiafaq import static
+from windiafaq.database.cache import FAQCache
+from windiafaq.database.types import Alias, Command
+
+
+__all__ = ["ImportResult", "PayloadError", "parse_payload", "dump_section"]
+
+
+class ImportResult(NamedTuple):
+    """What happened to one entry of an import
+
+    Attributes
+    ----------
+    kind : :class:`str`
+        `command` or `alias`
+
+    name : :class:`str`
+        The name of the command or alias
+
+    status : :class:`str`
+        `added`, `updated`, `skipped` or why the entry failed
+    """
+    kind: str
+    name: str
+    status: str
+
+
+class PayloadError(ValueError):
+    """Raised when an import payload is invalid, with every invalid entry
+
+    Attributes
+    ----------
+    results : :class:`list`[:class:`ImportResult`]
+        Why each invalid entry was rejected
+    """
+    def __init__(self, results: list[ImportResult]) -> None:
+        super().__init__(f"{len(results)} invalid entries")
+        self.results = results
+
+
+def _check_name(name: Any, reserved: Iterable[str]) -> str | None:
+    if not isinstance(name, str) or not name:
+        return "the name must be a non-empty string"
+
+    if name != name.lower() or any(c.isspace() for c in name):
+        return "the name must be lowercase without spaces"
+
+    if name in reserved:
+        return "the name is a bot command"
+
+    return None
+
+
+def parse_payload(data: bytes, cache: FAQCache, reserved: Iterable[str]) -> tuple[list[Command], list[Alias]]:
+    """Parses and validates an import payload against the cached commands
+
+    Parameters
+    ----------
+    data : :class:`bytes`
+        The YAML or JSON payload
+
+    cache : :class:`FAQCache`
+        The cache of the commands and aliases already stored
+
+    reserved : :class:`Iterable`[:class:`str`]
+        The names of the bot's own commands
+    Returns
+    -------
+    :class:`tuple`[:class:`list`[:class:`Command`], :class:`list`[:class:`Alias`]]
+        The commands and aliases to write, with aliases pointing at commands
+    Raises
+    ------
+    :class:`PayloadError`
+        The payload or any of its entries is invalid
+    """
+    reserved = set(reserved)
+
+    try:
+        payload = yaml.safe_load(data)
+    except yaml.YAMLError as e:
+        raise PayloadError([ImportResult("payload", "", f"not valid YAML: {e}")]) from e
+
+    if not isinstance(payload, dict) or not set(payload) <= {"commands", "aliases"}:
+        raise PayloadError([ImportResult("payload", "", "must be a mapping of `commands` and `aliases` lists")])
+
+    raw_commands, raw_aliases = payload.get("commands") or [], payload.get("aliases") or []
+    if not isinstance(raw_commands, list) or not isinstance(raw_aliases, list):
+        raise PayloadError([ImportResult("payload", "", "`commands` and `aliases` must be lists")])
+
+    errors: list[ImportResult] = []
+    seen: set[str] = set()
+    commands: list[Command] = []
+
+    for i, entry in enumerate(raw_commands):
+        if not isinstance(entry, dict):
+            errors.append(ImportResult("command", f"#{i + 1}", "must be a mapping"))
+            continue
+
+        name, description, hidden = entry.get("command"), entry.get("description"), entry.get("hidden")
+        if error := _check_name(name, reserved):
+            errors.append(ImportResult("command", str(name), error))
+        elif name in seen:
+            errors.append(ImportResult("command", name, "the name appears more than once"))
+        elif cache.get_alias(name):
+            errors.append(ImportResult("command", name, "an alias with this name exists"))
+        elif not isinstance(description, str) or not description:
+            errors.append(ImportResult("command", name, "the description must be a non-empty string"))
+        elif len(description) > static.FAQ_DESCRIPTION_MAX_LENGTH:
+            errors.append(ImportResult("command", name, f"the description is over {static.FAQ_DESCRIPTION_MAX_LENGTH} characters"))
+        elif hidden is not None and not isinstance(hidden, bool):
+            errors.append(ImportResult("command", name, "hidden must be true or false"))
+        else:
+            if hidden is None:
+                # keep an existing command hidden unless the payload says otherwise
+                hidden = (existing := cache.peek(name)) is not None and existing.hidden
+
+            commands.append(Command(name, description, hidden=hidden))
+
+        if isinstance(name, str):
+            seen.add(name)
+
+    imported = {command.command for command in commands}
+    aliases: list[Alias] = []
+
+    for i, entry in enumerate(raw_aliases):
+        if not isinstance(entry, dict):
+            errors.append(ImportResult("alias", f"#{i + 1}", "must be a mapping"))
+            continue
+
+        name, target = entry.get("alias"), entry.get("command")
+        if error := _check_name(name, reserved):
+            errors.append(ImportResult("alias", str(name), error))
+        elif name in seen:
+            errors.append(ImportResult("alias", name, "the name appears more than once"))
+        elif cache.is_command(name):
+            errors.append(ImportResult("alias", name, "a command with this name exists"))
+        elif not isinstance(target, str):
+            errors.append(ImportResult("alias", name, "the command must be a string"))
+        elif target in imported:
+            aliases.append(Alias(name, target))
+        elif command := cache.peek(target):
+            # an alias of an alias points at the command itself
+            aliases.append(Alias(name, command.command))
+        else:
+            errors.append(ImportResult("alias", name, f"the command {target} does not exist"))
+
+        if isinstance(name, str):
+            seen.add(name)
+
+    if errors:
+        raise PayloadError(errors)
+
+    return commands, aliases
+
+
+def dump_section(fp: IO[bytes], section: str, entries: Iterable[dict[str, Any]]) -> None:
+    """Writes one list of a payload entry by entry, so it never has to be held whole
+
+    Parameters
+    ----------
+    fp : :class:`IO`[:class:`bytes`]
+        The file to write to
+
+    section : :class:`str`
+        `commands` or `aliases`
+
+    entries : :class:`Iterable`[:class:`dict`[:class:`str`, :class:`Any`]]
+        The entries of the list
+    """
+    fp.write(f"{section}:\n".encode())
+    for entry in entries:
+        fp.write(yaml.safe_dump([entry], allow_unicode=True, sort_keys=False).encode())
@@ -0,0 +1,99 @@
+import threading
+
+from windiafaq import static
+
+
+__all__ = ["PrefixTrie"]
+
+
+class _Node:
+    __slots__ = ("children", "terminal")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.terminal = False
+
+
+class PrefixTrie:
+    """A prefix tree of names for autocompleting them
+
+    Completing a prefix walks to its node and collects names below it in
+    sorted order, stopping at the limit, so the cost depends on the prefix
+    and the limit rather than on the amount of names
+    """
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._root = _Node()
+            self._size = 0
+
+    def add(self, name: str) -> None:
+        with self._lock:
+            node = self._root
+            for char in name:
+                node = node.children.setdefault(char, _Node())
+
+            if not node.terminal:
+                node.terminal = True
+                self._size += 1
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            path = [self._root]
+            for char in name:
+                if (node := path[-1].children.get(char)) is None:
+                    return
+
+                path.append(node)
+
+            if not path[-1].terminal:
+                return
+
+            path[-1].terminal = False
+            self._size -= 1
+
+            # prune the branches that no longer lead to a name
+            for i in range(len(name), 0, -1):
+                if path[i].terminal or path[i].children:
+                    break
+
+                del path[i - 1].children[name[i - 1]]
+
+    def complete(self, prefix: str, *, limit: int = static.FAQ_AUTOCOMPLETE_LIMIT) -> list[str]:
+        """Gets the names starting with a prefix
+
+        Parameters
+        ----------
+        prefix : :class:`str`
+            The start of the names to get
+
+        limit : :class:`int`
+            The most names to return
+        Returns
+        -------
+        :class:`list`[:class:`str`]
+            The names starting with the prefix, in sorted order
+        """
+        with self._lock:
+            node = self._root
+            for char in prefix:
+                if (node := node.children.get(char)) is None:
+                    return []
+
+            names: list[str] = []
+            stack = [(prefix, node)]
+            while stack and len(names) < limit:
+                name, node = stack.pop()
+                if node.terminal:
+                    names.append(name)
+
+                stack.extend((name + char, node.children[char]) for char in sorted(node.children, reverse=True))
+
+            return names
@@ -0,0 +1,147 @@
+from typing import Any, Mapping
+import os
+import threading
+
+from loguru import logger
+from pymongo.errors import OperationFailure, PyMongoError
+from pymongo.mongo_client import MongoClient
+
+from windiafaq import static
+from windiafaq.database.database import FAQDatabase
+from windiafaq.database.types import Alias, Command
+
+
+__all__ = ["ChangeWatcher"]
+
+
+# the server refuses change streams when it is not part of a replica set
+_NOT_A_REPLICA_SET = 40573
+
+
+class ChangeWatcher(threading.Thread):
+    """Keeps a :class:`FAQDatabase` cache current with changes made elsewhere
+
+    A change stream over the commands and aliases collections pushes every
+    write, including those made by other bot processes or directly in Mongo,
+    and only the changed entry is applied to the cache. Writes made by this
+    process come back through the stream too, which is harmless as applying a
+    change is idempotent
+
+    The stream is resumed from the last change after a dropped connection.
+    When there is nothing to resume from, at start or when resuming fails,
+    the cache is reloaded in full once the new stream is open, so no change
+    made before the stream opened is lost. Pass `reload_on_open=False` when
+    the cache was just loaded from Mongo, to skip the reload at start
+
+    Attributes
+    ----------
+    database : :class:`FAQDatabase`
+        The database whose cache is kept current
+
+    applied : :class:`int`
+        The amount of changes applied to the cache
+    """
+    def __init__(self, database: FAQDatabase, reload_on_open: bool = True) -> None:
+        super().__init__(name="mongo-watcher", daemon=True)
+        self.database = database
+        self.applied = 0
+
+        self._client = MongoClient(os.environ["MONGO_CONNECT_URI"])
+        self._stopping = threading.Event()
+        self._resume_token: Mapping[str, Any] | None = None
+        self._reload_on_open = reload_on_open
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._client.close()
+
+    def run(self) -> None:
+        pipeline = [{"$match": {"ns.coll": {"$in": [static.MONGO_COLLECTION_COMMANDS, static.MONGO_COLLECTION_ALIASES]}}}]
+        db = self._client.get_database(static.MONGO_DATABASE)
+
+        while not self._stopping.is_set():
+            try:
+                with db.watch(pipeline, full_document="updateLookup", resume_after=self._resume_token, max_await_time_ms=static.MONGO_WATCH_MAX_AWAIT_MS) as stream:
+                    if self._reload_on_open:
+                        self.database.reload()
+                        self._reload_on_open = False
+                        logger.info("FAQ cache reloaded as its change stream opened")
+
+                    while not self._stopping.is_set() and stream.alive:
+                        if (change := stream.try_next()) is not None:
+                            self.apply(change)
+
+                        if not self._reload_on_open:
+                            self._resume_token = stream.resume_token
+            except OperationFailure as e:
+                if e.code == _NOT_A_REPLICA_SET:
+                    logger.warning("Mongo is not a replica set, the FAQ cache will not see changes made by other processes")
+                    if self._reload_on_open:
+                        self.reconcile()
+
+                    return
+
+                # the stream is reopened from a full reload, after a delay so a
+                # lasting failure such as missing permissions does not spin
+                logger.opt(exception=e).warning("FAQ change stream could not be resumed, reopening in {}s", static.MONGO_WATCH_RETRY_DELAY)
+                self._resume_token = None
+                self._reload_on_open = True
+                self._stopping.wait(static.MONGO_WATCH_RETRY_DELAY)
+            except PyMongoError as e:
+                if self._stopping.is_set():
+                    return
+
+                logger.opt(exception=e).warning("FAQ change stream interrupted, resuming in {}s", static.MONGO_WATCH_RETRY_DELAY)
+                self._stopping.wait(static.MONGO_WATCH_RETRY_DELAY)
+
+    def reconcile(self) -> None:
+        """Reloads the cache once without a change stream, retrying until Mongo answers"""
+        while not self._stopping.is_set():
+            try:
+                return self.database.reload()
+            except PyMongoError as e:
+                logger.opt(exception=e).warning("FAQ cache could not be reloaded, retrying in {}s", static.MONGO_WATCH_RETRY_DELAY)
+                self._stopping.wait(static.MONGO_WATCH_RETRY_DELAY)
+
+    def apply(self, change: Mapping[str, Any]) -> None:
+        """Applies one change stream event to the cache
+
+        Parameters
+        ----------
+        change : :class:`Mapping`[:class:`str`, :class:`Any`]
+            The change stream event
+        """
+        operation = change["operationType"]
+        if operation == "invalidate":
+            # the stream is over and cannot be resumed, start over from a full reload
+            self._resume_token = None
+            self._reload_on_open = True
+            return
+
+        if operation not in ("insert", "replace", "update", "delete"):
+            # a drop or rename of a collection does not end a database level
+            # stream, so reload now and keep following it. Should the reload
+            # fail, the stream is reopened and reloads then
+            self._reload_on_open = True
+            self.database.reload()
+            self._reload_on_open = False
+            logger.info("FAQ cache reloaded after a {} of {}", operation, change["ns"].get("coll"))
+            return
+
+        cache = self.database.cache
+        collection = change["ns"]["coll"]
+        key = change["documentKey"]["_id"]
+        document = change.get("fullDocument")
+
+        if operation == "delete" or document is None:
+            if collection == static.MONGO_COLLECTION_COMMANDS:
+                cache.remove_command(key)
+            else:
+                cache.remove_alias(key)
+        elif collection == static.MONGO_COLLECTION_COMMANDS:
+            cache.put_command(Command.from_document(document))
+        else:
+            cache.put_alias(Alias.from_document(document))
+
+        self.applied += 1
+        logger.debug("applied {} of {} {} to the FAQ cache", operation, collection, key)
@@ -1,3 +1,4 @@
 from .bot import *
 from .context import *
-from .embed import *
\ No newline at end of file
+from .embed import *
+from .paginator import *
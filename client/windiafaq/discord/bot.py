@@ -1,4 +1,5 @@
 import sys
+import time
 import traceback
 
 from discord import errors
@@ -7,11 +8,15 @@ from loguru import logger
 import discord
 
 from windiafaq import static
-from windiafaq.database.database import FAQDatabase
+from windiafaq.database.database import AsyncFAQDatabase
+from windiafaq.database.watcher import ChangeWatcher
 from windiafaq.discord.context import Context
 from windiafaq.discord.embed import ErrorEmbed
 from windiafaq.discord import extensions
-from windiafaq.tcp.client import TCPClient
+from windiafaq.executor import ExecutorSaturatedError, JobExecutor
+from windiafaq.metrics import DISPATCH_SECONDS, REGISTRY, MetricsServer
+from windiafaq.tcp.breaker import CircuitOpenError
+from windiafaq.tcp.client import RequestTimeoutError, TCPClient
 
 
 def format_traceback(tb: str) -> tuple[str | None, str]:
@@ -46,10 +51,24 @@ class WindiaFAQ(commands.Bot):
         help_command = commands.DefaultHelpCommand(command_attrs=dict(hidden=True))
         super().__init__(prefix, help_command=help_command, owner_id=static.BOT_OWNER_ID, intents=discord.Intents.all(), activity=discord.Game(f"{prefix}help"))
         self.tcp = TCPClient(tcp_endpoint)
-        self.db = FAQDatabase()
+        self.db = AsyncFAQDatabase()
+        self.watcher: ChangeWatcher | None = None
+        self.executor = JobExecutor(static.EXECUTOR_MAX_WORKERS, static.EXECUTOR_MAX_QUEUE)
+        self.metrics = MetricsServer(REGISTRY)
 
     async def setup_hook(self) -> None:
         self.tcp.connect()
+        await self.metrics.start()
+
+        # serve from the snapshot right away, the watcher reconciles with Mongo in the background.
+        # Without a snapshot the cache is loaded from Mongo here and the watcher need not reload it
+        reloaded = not await self.db.load_snapshot()
+        if reloaded:
+            await self.db.reload()
+
+        logger.info("FAQ cache loaded: {} commands, {} aliases", len(self.db.cache.commands), len(self.db.cache.aliases))
+        self.watcher = ChangeWatcher(self.db.sync, reload_on_open=not reloaded)
+        self.watcher.start()
 
         for extension in extensions.EXTENSIONS:
             try:
@@ -60,6 +79,12 @@ class WindiaFAQ(commands.Bot):
 
     async def close(self) -> None:
         self.tcp.disconnect()
+        if self.watcher is not None:
+            self.watcher.stop()
+
+        self.db.disconnect()
+        self.executor.shutdown()
+        await self.metrics.stop()
         return await super().close()
 
     async def on_message(self, message: discord.Message) -> None:
@@ -68,12 +93,52 @@ class WindiaFAQ(commands.Bot):
 
         return await super().on_message(message)
 
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        # stop any work done for a command whose message is gone
+        self.executor.cancel(payload.message_id)
+
     async def process_commands(self, message: discord.Message, /) -> None:
-        ctx = await self.get_context(message)
-        if ctx.command is None:
+        """Parses a message once and routes it to a bot command, a FAQ command or nothing
+
+        FAQ commands are handed to listeners through the `faq_command` event,
+        and prefixed words matching nothing through the `faq_command_miss` event
+        """
+        start = time.perf_counter()
+
+        if not self.is_prefixed(message.content):
+            if invoker := self.get_invoker(message.content):
+                self.dispatch("faq_command_miss", message, invoker.lower())
+
+            DISPATCH_SECONDS.observe(time.perf_counter() - start, route="miss" if invoker else "none")
             return
 
-        await self.invoke(ctx)
+        ctx = await self.get_context(message)
+        if ctx.command is not None:
+            DISPATCH_SECONDS.observe(time.perf_counter() - start, route="command")
+            return await self.invoke(ctx)
+
+        command = await ctx.get_faq_command()
+        DISPATCH_SECONDS.observe(time.perf_counter() - start, route="faq" if command else "none")
+
+        if command:
+            self.dispatch("faq_command", ctx, command)
+
+    def get_invoker(self, content: str) -> str | None:
+        """The first word after the prefix of a message, if it has the prefix"""
+        if not content.startswith(self.command_prefix):
+            return None
+
+        invoker = content[len(self.command_prefix):].split(maxsplit=1)
+        return invoker[0] if invoker else None
+
+    def is_prefixed(self, content: str) -> bool:
+        """A cheap check that a message could invoke a bot or FAQ command,
+        done before any context is built"""
+        if (invoker := self.get_invoker(content)) is None:
+            return False
+
+        lowered = invoker.lower()
+        return invoker in self.all_commands or lowered in self.all_commands or lowered in self.db.cache
 
     async def get_context(self, origin: discord.Message | discord.Interaction, /, *, cls=Context) -> Context:
         return await super().get_context(origin, cls=cls)
@@ -101,7 +166,11 @@ class WindiaFAQ(commands.Bot):
             return
 
         delete_after = None
-        if isinstance(exception, (commands.CommandInvokeError, commands.HybridCommandError, )):
+        if isinstance(getattr(exception, "original", None), (CircuitOpenError, RequestTimeoutError, )):
+            description = "The calculator is currently unavailable, please try again later!"
+        elif isinstance(getattr(exception, "original", None), ExecutorSaturatedError):
+            description = "I am busy right now, please try again in a moment!"
+        elif isinstance(exception, (commands.CommandInvokeError, commands.HybridCommandError, )):
             # a fatal error within a command that went unchecked
             description = "Uh oh >_<"
             await self.on_error(f'command {ctx.invoked_with}', exception)
@@ -1,3 +1,4 @@
+from typing import Any, Callable
 import asyncio
 import functools
 
@@ -5,10 +6,38 @@ from async_timeout import timeout
 from discord.ext import commands
 from loguru import logger
 
+from windiafaq import tracing
 from windiafaq.discord import context
+from windiafaq.metrics import REPLY_SECONDS
+from windiafaq.tcp.breaker import CircuitOpenError
+from windiafaq.tcp.cache import make_key
+from windiafaq.tcp.client import RequestTimeoutError
+from windiafaq.tcp.response import Response
 
 
 class TCPCommand(commands.Command):
+    """A command that is run on the calculator server
+
+    Identical calls that are in flight at the same time are coalesced into one
+    request. Commands passed `deterministic=True` are pure functions of their
+    arguments, so their responses are also cached by the client
+
+    A `fallback` is a picklable function taking the command's arguments and
+    returning the payload the server would reply with. It is run on the bot's
+    executor when the server is unreachable or saturated
+
+    A `local` function takes the same arguments and is run inline before the
+    server is asked. It returns a payload for calls it can answer cheaply in
+    process, or :class:`None` to pass the call on to the server
+
+    Every invocation is traced, see :mod:`windiafaq.tracing`
+    """
+    def __init__(self, func, /, **kwargs) -> None:
+        super().__init__(func, **kwargs)
+        self.deterministic: bool = kwargs.get("deterministic", False)
+        self.fallback: Callable[..., dict[str, Any]] | None = kwargs.get("fallback")
+        self.local: Callable[..., dict[str, Any] | None] | None = kwargs.get("local")
+
     async def invoke(self, ctx: context.Context, /) -> None:
         new_callback = functools.partial(self.invoke_tcp_command, *ctx.args, *ctx.kwargs)
         functools.update_wrapper(new_callback, ctx.command.callback)
@@ -18,15 +47,55 @@ class TCPCommand(commands.Command):
     async def invoke_tcp_command(self, _: commands.Cog, ctx: context.Context, *args, **kwargs):
         if ctx.invoked_parents:
             command = ctx.invoked_parents[0]
-            args = [ctx.command.name] + args
+            args = (ctx.command.name, *args)
         else:
             command = ctx.command.name
 
-        logger.info("sending command: {} (args={}, kwargs={})", command, args, kwargs)
-        await ctx.bot.tcp.send_command(command, *args, **kwargs)
+        with tracing.start_trace(command) as trace:
+            key = make_key(command, args)
+            if self.deterministic and (resp := ctx.bot.tcp.cache.get(key)) is not None:
+                logger.info("cached response for command: {} (args={}, trace={})", command, args, trace.trace_id)
+                return await self.reply_response(ctx, command, resp)
+
+            logger.info("sending command: {} (args={}, kwargs={}, trace={})", command, args, kwargs, trace.trace_id)
+            # identical calls already in flight share one server computation,
+            # its spans are recorded in the trace of the call that started it
+            with trace.span("flight"):
+                resp = await ctx.bot.tcp.flights.do(key, lambda: self.request(ctx, command, args))
+
+            logger.info("got response for command: {} (trace={})", command, trace.trace_id)
+            if self.deterministic:
+                ctx.bot.tcp.cache.put(key, resp)
+
+            return await self.reply_response(ctx, command, resp)
+
+    async def reply_response(self, ctx: context.Context, command: str, resp: Response):
+        with REPLY_SECONDS.time(command=command, stage="build"), tracing.span("reply/build"):
+            embeds = resp.embeds()
+
+        with REPLY_SECONDS.time(command=command, stage="send"), tracing.span("reply/send"):
+            return await ctx.reply(resp.content, embeds=embeds)
+
+    async def request(self, ctx: context.Context, command: str, args: tuple) -> Response:
+        if self.local is not None:
+            with tracing.span("local"):
+                payload = self.local(*args)
+
+            if payload is not None:
+                return Response(**payload)
+
+        tcp = ctx.bot.tcp
+        if self.fallback is None:
+            return await tcp.request(command, *args)
+
+        if not tcp.breaker.is_open and not tcp.saturated:
+            try:
+                return await tcp.request(command, *args)
+            except (CircuitOpenError, RequestTimeoutError):
+                pass
 
-        logger.info("waiting for response from server for command: {}", command)
-        resp = await ctx.bot.tcp.wait_response()
+        logger.warning("calculator server unavailable, running {} locally", command)
+        with tracing.span("fallback"):
+            payload = await ctx.bot.executor.run(self.fallback, *args)
 
-        logger.info("got response from server for command: {}", command)
-        return await ctx.reply(resp.content, embeds=resp.embeds())
+        return Response(**payload)
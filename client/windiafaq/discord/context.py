@@ -11,6 +11,7 @@ __all__ = ["Context"]
 class Context(commands.Context):
     def __init__(self, *, message: Message, bot, **kwargs):
         super().__init__(message=message, bot=bot, **kwargs)
+        self.faq_command_title: str = None
 
     @property
     def in_dm(self) -> bool:
@@ -38,36 +39,35 @@ class Context(commands.Context):
 
         return self.channel.permissions_for(self.author).manage_messages
 
-    async def reply(self, content: str | None = None, **kwargs) -> Message:
-        if self.message.reference:
-            if message := self.message.reference.cached_message:
-                return await message.reply(content, **kwargs)
+    @property
+    def check(self) -> bool:
+        if self.in_dm:
+            return True
 
-        return await super().reply(content, **kwargs)
+        if not self.in_lossdia or self.in_bot_channel:
+            return True
 
+        return self.is_owner or self.is_moderator
 
-class FAQContext(Context):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.faq_command_title: str = None
+    async def get_faq_command(self) -> Command | None:
+        """Resolves the FAQ command this context was invoked with,
+        using the prefix and invoker already parsed by :meth:`Bot.get_context`"""
+        if self.prefix is None or not self.invoked_with:
+            return None
 
-    def get_faq_command(self) -> Command | None:
-        if not self.message.content.startswith(self.bot.command_prefix):
+        self.faq_command_title = command = self.invoked_with.lower()
+        if command not in self.bot.db.cache:
+            # rejects typos, other bots' commands and spam without a lookup
             return None
 
-        raw_command = self.message.content[len(self.bot.command_prefix):].split(' ')
-        self.faq_command_title = command = raw_command[0].lower()
         if self.bot.get_command(command):
             return None
-        
-        return self.bot.db.get_command(command)
 
-    @property
-    def check(self) -> bool:
-        if self.in_dm:
-            return True
+        return await self.bot.db.get_command(command)
 
-        if not self.in_lossdia or self.in_bot_channel:
-            return True
+    async def reply(self, content: str | None = None, **kwargs) -> Message:
+        if self.message.reference:
+            if message := self.message.reference.cached_message:
+                return await message.reply(content, **kwargs)
 
-        return self.is_owner or self.is_moderator
+        return await super().reply(content, **kwargs)
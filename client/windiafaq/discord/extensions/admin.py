@@ -1,7 +1,11 @@
+import io
+
 from discord.ext import commands
+import discord
 
 from windiafaq.discord.bot import WindiaFAQ
 from windiafaq.discord.context import Context
+from windiafaq.metrics import REGISTRY, Counter, Histogram
 
 class AdminCog(commands.Cog, command_attrs=dict(hidden=True)):
     def __init__(self, bot: WindiaFAQ) -> None:
@@ -40,6 +44,35 @@ class AdminCog(commands.Cog, command_attrs=dict(hidden=True)):
     async def _say(self, ctx: Context, *, text: str):
         return await ctx.reply(text)
 
+    @admin_group.command(
+        name="stats",
+        description="shows latency and throughput metrics",
+    )
+    async def _stats(self, ctx: Context):
+        lines = [
+            f"FAQ cache: {self.bot.db.cache.hit_rate:.1%} hit rate, {len(self.bot.db.cache.commands)} commands, {len(self.bot.db.cache.aliases)} aliases",
+            f"Calculator: {self.bot.tcp.cache.hit_rate:.1%} result cache hit rate, {self.bot.tcp.pending} pending, circuit {'open' if self.bot.tcp.breaker.is_open else 'closed'}",
+            f"Executor: {self.bot.executor.depth} jobs queued or running",
+        ]
+
+        for metric in REGISTRY.metrics.values():
+            if isinstance(metric, Histogram) and (series := metric.series()):
+                lines += ["", f"{metric.name} (count, mean/p50/p95 ms)"]
+                for key, (count, total) in sorted(series.items()):
+                    labels = dict(zip(metric.labels, key))
+                    p50, p95 = metric.quantile(.5, **labels) * 1000, metric.quantile(.95, **labels) * 1000
+                    lines.append(f"  {'/'.join(key):<24} {count:>8} {total / count * 1000:>9.2f} {p50:>9.2f} {p95:>9.2f}")
+            elif isinstance(metric, Counter) and (values := metric.values()):
+                lines += ["", metric.name]
+                for key, value in sorted(values.items()):
+                    lines.append(f"  {'/'.join(key):<24} {value:>8.0f}")
+
+        text = "\n".join(lines)
+        if len(text) < 1900:
+            return await ctx.reply(f"```\n{text}```")
+
+        return await ctx.reply(file=discord.File(io.BytesIO(text.encode()), filename="stats.txt"))
+
     @admin_group.group(
         name="extension",
         description="shows all loaded extensions",
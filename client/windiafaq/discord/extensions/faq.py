@@ -1,25 +1,33 @@
 import re
 
+from discord import app_commands
 from discord.ext import commands
+from loguru import logger
+from pymongo.errors import PyMongoError
 import discord
 
-from windiafaq import utils
+from windiafaq import static
+from windiafaq.database.types import Command
 from windiafaq.discord.bot import WindiaFAQ
 from windiafaq.discord.embed import NormalEmbed
-from windiafaq.discord.context import Context, FAQContext
+from windiafaq.discord.paginator import FAQPaginator
+from windiafaq.discord.context import Context
+from windiafaq.metrics import REPLY_SECONDS
 
 class FAQ(commands.Cog):
     def __init__(self, bot: WindiaFAQ) -> None:
         self.bot = bot
         self.image_url_regex = re.compile(r'^https?:\/\/(?:[a-z0-9\-]+\.)+[a-z]{2,6}(?:\/[^\/#?]+)+\.(?:jpg|gif|png)$')
+        self.suggest_cooldown = commands.CooldownMapping.from_cooldown(1, static.FAQ_SUGGEST_COOLDOWN, commands.BucketType.channel)
 
     async def cog_check(self, ctx: Context) -> bool:
-        ctx: FAQContext = await self.bot.get_context(ctx.message, cls=FAQContext)
         return ctx.check
 
-    @commands.hybrid_command(
+    @commands.hybrid_group(
         name="faq",
         description="displays all FAQ commands",
+        invoke_without_command=True,
+        fallback="list",
     )
     async def faq_group(self, ctx: Context):
         """displays all FAQ commands"""
@@ -27,32 +35,101 @@ class FAQ(commands.Cog):
         if ctx.interaction:
             await ctx.defer()
 
-        all_commands = sorted(self.bot.db.get_all())
-        columns = utils.make_columns(all_commands)
+        return await FAQPaginator(ctx).start()
 
-        embed = NormalEmbed(title="FAQ Commands", description=f"```\n{columns}```")
+    @faq_group.command(
+        name="search",
+        description="searches the FAQ commands by their content",
+        usage="<terms>",
+    )
+    async def faq_search(self, ctx: Context, *, terms: str):
+        """searches the FAQ commands by their content
+
+        examples:
+        $faq search hp washing shows the FAQ commands that best match "hp washing"
+        """
+        results = self.bot.db.cache.search.search(terms)
+        if not results:
+            return await ctx.reply(f"No FAQ commands matched `{terms}`.")
+
+        lines = []
+        for name, _ in results:
+            if (command := self.bot.db.cache.peek(name)) is None:
+                continue
+
+            snippet = command.description.split("\n", 1)[0]
+            if len(snippet) > static.FAQ_SEARCH_SNIPPET_LENGTH:
+                snippet = snippet[:static.FAQ_SEARCH_SNIPPET_LENGTH - 3] + "..."
+
+            lines.append(f"`{static.BOT_PREFIX}{name}` {snippet}")
+
+        embed = NormalEmbed(title="FAQ Search", description="\n".join(lines))
         return await ctx.reply(embed=embed)
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        ctx: FAQContext = await self.bot.get_context(message, cls=FAQContext)
-        if ctx.author.bot:
-            return
+    @faq_group.command(
+        name="show",
+        description="shows a FAQ command",
+        usage="<name>",
+    )
+    @app_commands.describe(name="the FAQ command or alias to show")
+    async def faq_show(self, ctx: Context, *, name: str):
+        """shows a FAQ command, the same as using $<name>"""
+        name = name.lower()
+        if (command := await self.bot.db.get_command(name)) is None:
+            # the entry may be newer than the cache, e.g. while serving from the snapshot
+            try:
+                command = await self.bot.db.fetch_command(name)
+            except PyMongoError:
+                logger.opt(exception=True).warning("could not fetch FAQ command: {}", name)
 
-        command = ctx.get_faq_command()
         if command is None:
-            return
+            if suggestions := self.bot.db.cache.suggest(name):
+                names = ", ".join(f"`{suggestion}`" for suggestion in suggestions)
+                return await ctx.reply(f"No FAQ command named `{name}`. Did you mean {names}?")
+
+            return await ctx.reply(f"No FAQ command named `{name}`.")
+
+        return await self.reply_faq_command(ctx, name, command)
+
+    @faq_show.autocomplete("name")
+    async def faq_show_autocomplete(self, _: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+        # served from memory, autocomplete must answer within 3 seconds
+        return [app_commands.Choice(name=name, value=name) for name in self.bot.db.cache.completions.complete(current.lower())]
 
+    @commands.Cog.listener()
+    async def on_faq_command(self, ctx: Context, command: Command):
         if not ctx.check:
-            return await ctx.reply(f"Please use the bot channel, {message.author.mention}.", delete_after=5.0)
+            return await ctx.reply(f"Please use the bot channel, {ctx.author.mention}.", delete_after=5.0)
 
-        embed = NormalEmbed(title=ctx.faq_command_title, description=command.description, author=ctx.author)
+        return await self.reply_faq_command(ctx, ctx.faq_command_title, command)
 
-        if match := self.image_url_regex.match(command.description):
-            image_url = match.group(0)
-            embed.set_image(url=image_url)
+    async def reply_faq_command(self, ctx: Context, title: str, command: Command):
+        with REPLY_SECONDS.time(command="faq", stage="build"):
+            embed = NormalEmbed(title=title, description=command.description, author=ctx.author)
 
-        return await ctx.reply(embed=embed)
+            if match := self.image_url_regex.match(command.description):
+                image_url = match.group(0)
+                embed.set_image(url=image_url)
+
+        with REPLY_SECONDS.time(command="faq", stage="send"):
+            return await ctx.reply(embed=embed)
+
+    @commands.Cog.listener()
+    async def on_faq_command_miss(self, message: discord.Message, invoker: str):
+        suggestions = self.bot.db.cache.suggest(invoker)
+        if not suggestions:
+            return
+
+        ctx = await self.bot.get_context(message)
+        if not ctx.check:
+            return
+
+        # one suggestion per channel per cooldown so typos don't flood it
+        if self.suggest_cooldown.get_bucket(message).update_rate_limit():
+            return
+
+        names = ", ".join(f"`{static.BOT_PREFIX}{name}`" for name in suggestions)
+        return await ctx.reply(f"Did you mean {names}?")
 
 
 async def setup(bot: WindiaFAQ) -> None:
@@ -1,5 +1,12 @@
+from collections import Counter
+import io
+import tempfile
+
 from discord.ext import commands
+import discord
 
+from windiafaq import static
+from windiafaq.database.transfer import ImportResult, PayloadError, parse_payload
 from windiafaq.discord.bot import WindiaFAQ
 from windiafaq.discord.embed import ErrorEmbed
 from windiafaq.discord.context import Context
@@ -30,6 +37,8 @@ class Moderator(commands.Cog):
         To add a command, $commands add <command> <description>
         To update a command, $commands update <command> <description>
         To delete a command, $commands delete <command>
+        To add or replace many commands and aliases, $commands import with a YAML file attached
+        To download every command and alias, $commands export
         """
 
         if ctx.invoked_subcommand:
@@ -45,7 +54,7 @@ class Moderator(commands.Cog):
     async def _commands_add(self, ctx: Context, command: str, *, description: str):
         """ex: $commands add example this is an example"""
 
-        if self.bot.db.add_command(command, description):
+        if await self.bot.db.add_command(command, description):
             return await ctx.reply(f"{command} added.")
         else:
             return await ctx.reply(f"{command} was not added.")
@@ -58,7 +67,7 @@ class Moderator(commands.Cog):
     async def _commands_add_special(self, ctx: Context, command: str, *, description: str):
         """ex: $commands add example this is an example"""
 
-        if self.bot.db.add_command(command, description, hidden=True):
+        if await self.bot.db.add_command(command, description, hidden=True):
             return await ctx.reply(f"{command} added.")
         else:
             return await ctx.reply(f"{command} was not added.")
@@ -71,7 +80,7 @@ class Moderator(commands.Cog):
     async def _commands_update(self, ctx: Context, command: str, *, description: str):
         """ex: $commands update example this is an example updated"""
 
-        if self.bot.db.update_command(command, description):
+        if await self.bot.db.update_command(command, description):
             return await ctx.reply(f"{command} updated.")
         else:
             return await ctx.reply(f"{command} was not updated.")
@@ -84,11 +93,64 @@ class Moderator(commands.Cog):
     async def _commands_delete(self, ctx: Context, command: str):
         """ex: $commands delete example"""
 
-        if self.bot.db.delete_command(command):
+        if await self.bot.db.delete_command(command):
             return await ctx.reply(f"{command} deleted.")
         else:
             return await ctx.reply(f"{command} was not deleted.")
 
+    @_commands.command(
+        name="import",
+        usage="(attach a YAML file)",
+        description="adds or replaces FAQ commands and aliases from a YAML file",
+    )
+    async def _commands_import(self, ctx: Context):
+        """ex: $commands import, with a file in the format of $commands export attached
+
+        the whole file is checked before anything is written, so an invalid file
+        imports nothing. if writing fails part way, the entries before the failed
+        one stay imported and the reply says where it stopped
+        """
+
+        if not ctx.message.attachments:
+            return await ctx.reply("Attach a YAML file to import, see $commands export for the format.")
+
+        attachment = ctx.message.attachments[0]
+        if attachment.size > static.FAQ_IMPORT_MAX_BYTES:
+            return await ctx.reply(f"The file is over {static.FAQ_IMPORT_MAX_BYTES:,} bytes.")
+
+        try:
+            commands_, aliases = parse_payload(await attachment.read(), self.bot.db.cache, self.bot.all_commands)
+        except PayloadError as e:
+            return await self._reply_import_results(ctx, "Nothing was imported, fix these entries and try again.", e.results)
+
+        results = await self.bot.db.import_entries(commands_, aliases)
+        counts = Counter(result.status.split(":", 1)[0] for result in results)
+        summary = f"{counts['added']} added, {counts['updated']} updated, {counts['failed']} failed, {counts['skipped']} skipped."
+        if failed := next((result for result in results if result.status.startswith("failed")), None):
+            summary += f" The import stopped at {failed.kind} {failed.name}, the entries before it were imported."
+        return await self._reply_import_results(ctx, summary, results)
+
+    async def _reply_import_results(self, ctx: Context, summary: str, results: list[ImportResult]):
+        lines = "\n".join(f"{result.kind} {result.name}: {result.status}" for result in results)
+        if len(summary) + len(lines) < 1900:
+            return await ctx.reply(f"{summary}\n```\n{lines}```")
+
+        file = discord.File(io.BytesIO(lines.encode()), filename="import_results.txt")
+        return await ctx.reply(summary, file=file)
+
+    @_commands.command(
+        name="export",
+        description="downloads every FAQ command and alias as a YAML file",
+    )
+    async def _commands_export(self, ctx: Context):
+        """ex: $commands export"""
+
+        # a real file, discord.File takes a SpooledTemporaryFile for a path before Python 3.11
+        with tempfile.TemporaryFile() as fp:
+            await self.bot.db.export(fp)
+            fp.seek(0)
+            return await ctx.reply(file=discord.File(fp, filename="faq.yaml"))
+
     @commands.group(
         name="aliases",
         description="a group to manage FAQ aliases and aliases",
@@ -112,7 +174,7 @@ class Moderator(commands.Cog):
     async def _alias_add(self, ctx: Context, alias: str, command: str):
         """ex: $aliases add example_alias example_command"""
 
-        if self.bot.db.add_alias(alias, command):
+        if await self.bot.db.add_alias(alias, command):
             return await ctx.reply(f"{alias} added.")
         else:
             return await ctx.reply(f"{alias} was not added.")
@@ -125,7 +187,7 @@ class Moderator(commands.Cog):
     async def _alias_delete(self, ctx: Context, alias: str):
         """ex: $aliases delete example_alias"""
 
-        if self.bot.db.delete_alias(alias):
+        if await self.bot.db.delete_alias(alias):
             return await ctx.reply(f"{alias} deleted.")
         else:
             return await ctx.reply(f"{alias} was not deleted.")
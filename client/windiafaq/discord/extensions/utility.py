@@ -5,12 +5,22 @@ from discord.ext import commands
 import discord.utils
 
 from windiafaq import static
+from windiafaq.calculator import ees, flame, magic
 from windiafaq.discord.bot import WindiaFAQ
 from windiafaq.discord.command import TCPCommand
 from windiafaq.discord.context import Context
 from windiafaq.discord.embed import NormalEmbed
 
 
+def _exact_flag(argument: str) -> str:
+    """Converts the flag of $ees and $aees, so an unknown flag is a usage error
+    rather than a request to the calculator"""
+    if argument != "-a":
+        raise commands.BadArgument(f"Unknown flags: {argument}")
+
+    return argument
+
+
 class Utility(commands.Cog):
     def __init__(self, bot: WindiaFAQ) -> None:
         self.bot = bot
@@ -30,6 +40,8 @@ class Utility(commands.Cog):
         usage="<item level>",
         aliases=["flames",],
         cls=TCPCommand,
+        local=flame.flame,
+        deterministic=True,
     )
     async def _flame(self, ctx: Context, level: int):
         """shows the flame range for a certain level of gear"""
@@ -37,31 +49,37 @@ class Utility(commands.Cog):
     @commands.command(
         name="ees",
         description="simulates EES from start to end",
-        usage="<start> <end> <protect delta>",
+        usage="<start> <end> <protect delta> [-a]",
         cls=TCPCommand,
+        local=ees.ees_analytic,
+        fallback=ees.ees,
     )
-    async def _ees(self, ctx: Context, start: int, end: int, protect_delta: int):
+    async def _ees(self, ctx: Context, start: int, end: int, protect_delta: int, flags: _exact_flag = ""):
         """simulates EES from start to end
         
         start must be a number between 0 and 14
         end must be a number between 1 and 15
         protect delta must be a number between 0 and 4
         protect delta is the number of stars before a safety point (10, 15) where you will use a SF Prot scroll
+        -a computes the exact expected cost, spread and percentiles instead of simulating
         """
 
     @commands.command(
         name="aees",
         description="simulates AEES from start to end",
-        usage="<start> <end> <protect delta>",
+        usage="<start> <end> <protect delta> [-a]",
         cls=TCPCommand,
+        local=ees.aees_analytic,
+        fallback=ees.aees,
     )
-    async def _aees(self, ctx: Context, start: int, end: int, protect_delta: int):
+    async def _aees(self, ctx: Context, start: int, end: int, protect_delta: int, flags: _exact_flag = ""):
         """simulates EES from start to end
         
         start must be a number between 0 and 14
         end must be a number between 1 and 15
         protect delta must be a number between 0 and 4
         protect delta is the number of stars before a safety point (10, 15) where you will use a SF Prot scroll
+        -a computes the exact expected cost, spread and percentiles instead of simulating
         """
 
     @commands.command(
@@ -69,6 +87,8 @@ class Utility(commands.Cog):
         description="shows how much magic is needed to one shot a monster with given HP",
         usage="<hp> <spell attack> [<flags>]",
         cls=TCPCommand,
+        local=magic.magic,
+        deterministic=True,
     )
     async def _magic(self, ctx: commands.Context, hp: int, spell_attack: int, flags: str = ""):
         """shows how much magic is needed to one shot a monster with given HP
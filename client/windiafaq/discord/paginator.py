@@ -0,0 +1,78 @@
+import discord
+
+from windiafaq import static
+from windiafaq.discord.context import Context
+from windiafaq.discord.embed import NormalEmbed
+
+
+__all__ = ["FAQPaginator"]
+
+
+class FAQPaginator(discord.ui.View):
+    """Pages through the FAQ commands with buttons
+
+    Only the page being shown is rendered, from the sorted names kept by the
+    database cache, so the listing never overflows an embed
+
+    Attributes
+    ----------
+    page : :class:`int`
+        The zero-based number of the page being shown
+
+    page_size : :class:`int`
+        The amount of commands on a page
+    """
+    def __init__(self, ctx: Context, *, page_size: int = static.FAQ_PAGE_SIZE, timeout: float = static.FAQ_PAGINATOR_TIMEOUT) -> None:
+        super().__init__(timeout=timeout)
+        self.ctx = ctx
+        self.page = 0
+        self.page_size = page_size
+        self.message: discord.Message | None = None
+
+    @property
+    def pages(self) -> int:
+        return self.ctx.bot.db.cache.page_count(self.page_size)
+
+    def embed(self) -> NormalEmbed:
+        # commands may have been deleted since the last page was shown
+        self.page = min(self.page, self.pages - 1)
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page == self.pages - 1
+
+        page = self.ctx.bot.db.cache.page(self.page, self.page_size)
+        embed = NormalEmbed(title="FAQ Commands", description=f"```\n{page}```")
+        embed.set_footer(text=f"Page {self.page + 1}/{self.pages}")
+        return embed
+
+    async def start(self) -> discord.Message:
+        """Replies with the first page, with buttons if there is more than one"""
+        embed = self.embed()
+        self.message = await self.ctx.reply(embed=embed, view=self if self.pages > 1 else None)
+        return self.message
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id == self.ctx.author.id:
+            return True
+
+        await interaction.response.send_message("Only the person who used this command can change its page.", ephemeral=True)
+        return False
+
+    async def on_timeout(self) -> None:
+        for item in self.children:
+            item.disabled = True
+
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        self.page = max(self.page - 1, 0)
+        await interaction.response.edit_message(embed=self.embed(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        self.page += 1
+        await interaction.response.edit_message(embed=self.embed(), view=self)
@@ -0,0 +1,124 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable
+import asyncio
+import multiprocessing
+
+
+__all__ = ["JobExecutor", "ExecutorSaturatedError"]
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when a job is refused because too many jobs are already waiting"""
+
+
+class JobExecutor:
+    """A process pool cogs submit CPU-heavy jobs to
+
+    At most `max_workers` jobs are handed to the pool at once, the rest wait on
+    the event loop so they can still be cancelled before they start. A job
+    cancelled once it is running keeps its worker until it finishes. Once
+    `max_queue` jobs are queued or running, new jobs are refused
+
+    Attributes
+    ----------
+    max_workers : :class:`int`
+        The amount of worker processes
+
+    max_queue : :class:`int`
+        The maximum amount of jobs queued or running at once
+
+    queued : :class:`int`
+        The amount of jobs waiting for a worker
+
+    running : :class:`int`
+        The amount of jobs running on a worker
+    """
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        # spawned workers do not inherit the bot's sockets and threads
+        self._pool = ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn"))
+        self._slots = asyncio.Semaphore(max_workers)
+        self._jobs: dict[int, set[asyncio.Task]] = {}
+
+        self.queued = 0
+        self.running = 0
+
+    @property
+    def depth(self) -> int:
+        """The amount of jobs queued or running"""
+        return self.queued + self.running
+
+    async def run(self, func: Callable[..., Any], *args, message_id: int | None = None) -> Any:
+        """Runs a function on the process pool
+
+        Parameters
+        ----------
+        func : :class:`Callable`
+            A picklable, module level function to run
+
+        args
+            The arguments to call the function with
+
+        message_id : :class:`int` | :class:`None`
+            The message that invoked the job. If it is deleted, the job is cancelled,
+            though a job already running on a worker still runs to completion
+        Returns
+        -------
+        :class:`Any`
+            The return value of the function
+        Raises
+        ------
+        :class:`ExecutorSaturatedError`
+            Too many jobs are already queued or running
+        """
+        if self.depth >= self.max_queue:
+            raise ExecutorSaturatedError(f"{self.depth} jobs are already queued or running")
+
+        task = asyncio.current_task()
+        if message_id is not None:
+            self._jobs.setdefault(message_id, set()).add(task)
+
+        try:
+            self.queued += 1
+            try:
+                await self._slots.acquire()
+            finally:
+                self.queued -= 1
+
+            self.running += 1
+            try:
+                future = self._pool.submit(func, *args)
+            except BaseException:
+                self._release()
+                raise
+
+            loop = asyncio.get_running_loop()
+
+            def done(_: Future) -> None:
+                # called from the pool's thread once the worker is done with the job
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(self._release)
+
+            # a worker cannot be interrupted, so the slot of a cancelled job that
+            # already started is only released once the job is actually done
+            future.add_done_callback(done)
+            return await asyncio.wrap_future(future)
+        finally:
+            if message_id is not None and (tasks := self._jobs.get(message_id)):
+                tasks.discard(task)
+                if not tasks:
+                    del self._jobs[message_id]
+
+    def _release(self) -> None:
+        self.running -= 1
+        self._slots.release()
+
+    def cancel(self, message_id: int) -> None:
+        """Cancels the jobs invoked by a message"""
+        for task in self._jobs.pop(message_id, ()):
+            task.cancel()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,275 @@
+"""An in-process metrics registry with counters and latency histograms
+
+Every metric of the client is declared here, so instrumented modules only
+import the one they record to. The registry renders in the Prometheus text
+format, served by :class:`MetricsServer`, and summarizes for `$admin stats`
+"""
+from typing import Any, Iterator
+import bisect
+import contextlib
+import threading
+import time
+
+from aiohttp import web
+from loguru import logger
+
+from windiafaq import static
+
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "Registry",
+    "MetricsServer",
+    "REGISTRY",
+    "DISPATCH_SECONDS",
+    "FAQ_LOOKUP_SECONDS",
+    "MONGO_SECONDS",
+    "MONGO_ERRORS",
+    "TCP_SECONDS",
+    "REPLY_SECONDS",
+]
+
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: Labels = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> Labels:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} takes the labels {self.labels}, not {tuple(labels)}")
+
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    """A value that only goes up, such as the amount of errors"""
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Labels = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1., **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.) + amount
+
+    def values(self) -> dict[Labels, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for key, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+
+        return lines
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.
+
+
+class Histogram(_Metric):
+    """Counts of observed values, such as latencies, in fixed buckets
+
+    Attributes
+    ----------
+    buckets : :class:`tuple`[:class:`float`, ...]
+        The upper bounds of the buckets, in seconds for latencies
+    """
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Labels = (), *, buckets: tuple[float, ...] = static.METRICS_LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: dict[Labels, _Series] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            if (series := self._series.get(key)) is None:
+                series = self._series[key] = _Series(len(self.buckets))
+
+            series.buckets[i] += 1
+            series.count += 1
+            series.sum += value
+
+    @contextlib.contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observes how long the body of a `with` block takes"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def quantile(self, q: float, **labels: str) -> float:
+        """Estimates a quantile by interpolating within its bucket"""
+        with self._lock:
+            if (series := self._series.get(self._key(labels))) is None or not series.count:
+                return 0.
+
+            buckets = list(series.buckets)
+            rank = q * series.count
+
+        seen, lower = 0, 0.
+        for upper, count in zip(self.buckets, buckets):
+            if count and seen + count >= rank:
+                if upper == float("inf"):
+                    return lower
+
+                return lower + (upper - lower) * (rank - seen) / count
+
+            seen += count
+            lower = upper
+
+        return lower
+
+    def series(self) -> dict[Labels, tuple[int, float]]:
+        """The count and sum of every labelled series"""
+        with self._lock:
+            return {key: (series.count, series.sum) for key, series in self._series.items()}
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            series = {key: (list(s.buckets), s.count, s.sum) for key, s in self._series.items()}
+
+        for key, (buckets, count, total) in sorted(series.items()):
+            cumulative = 0
+            for upper, bucket in zip(self.buckets, buckets):
+                cumulative += bucket
+                le = 'le="' + _format_value(upper) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+
+        return lines
+
+
+class Registry:
+    """Holds every metric by name"""
+    def __init__(self) -> None:
+        self.metrics: dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labels: Labels = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Labels = (), **kwargs: Any) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, **kwargs))
+
+    def _register(self, metric: _Metric) -> Any:
+        if metric.name in self.metrics:
+            raise ValueError(f"metric already registered: {metric.name}")
+
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text format"""
+        return "\n".join(line for metric in self.metrics.values() for line in metric.render()) + "\n"
+
+
+class MetricsServer:
+    """Serves a registry over HTTP at `/metrics` for Prometheus to scrape"""
+    def __init__(self, registry: Registry, host: str = static.METRICS_HOST, port: int = static.METRICS_PORT) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+
+        self._runner: web.AppRunner | None = None
+
+    async def _metrics(self, _: web.Request) -> web.Response:
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8", headers={"X-Content-Type-Options": "nosniff"})
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+
+        try:
+            await web.TCPSite(self._runner, self.host, self.port).start()
+        except OSError:
+            # another bot process on this host may already serve the port
+            logger.opt(exception=True).warning("could not serve metrics on {}:{}", self.host, self.port)
+            return await self.stop()
+
+        logger.info("serving metrics on http://{}:{}/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+REGISTRY = Registry()
+
+DISPATCH_SECONDS = REGISTRY.histogram(
+    "windiafaq_dispatch_seconds",
+    "Time from a prefixed message to its route being handled, by route",
+    ("route",),
+)
+FAQ_LOOKUP_SECONDS = REGISTRY.histogram(
+    "windiafaq_faq_lookup_seconds",
+    "Time to look up a FAQ command, by source and result",
+    ("source", "result"),
+)
+MONGO_SECONDS = REGISTRY.histogram(
+    "windiafaq_mongo_operation_seconds",
+    "Time of Mongo operations, by operation",
+    ("operation",),
+)
+MONGO_ERRORS = REGISTRY.counter(
+    "windiafaq_mongo_errors_total",
+    "Mongo operations that raised, by operation",
+    ("operation",),
+)
+TCP_SECONDS = REGISTRY.histogram(
+    "windiafaq_tcp_round_trip_seconds",
+    "Time from sending a calculator request to its reply, by command and result",
+    ("command", "result"),
+)
+REPLY_SECONDS = REGISTRY.histogram(
+    "windiafaq_reply_seconds",
+    "Time to build a reply's embeds and to send it to Discord, by command and stage",
+    ("command", "stage"),
+)
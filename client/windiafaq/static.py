@@ -9,10 +9,79 @@ BOT_EMBED_COLOR_NORMAL = discord.Color.from_str("#bbbefe")
 BOT_EMBED_COLOR_ERROR = discord.Color.red()
 BOT_PREFIX = "$"
 
+FAQ_PAGE_SIZE = 60
+FAQ_PAGINATOR_TIMEOUT = 180.0
+FAQ_SEARCH_K1 = 1.2
+FAQ_SEARCH_B = 0.75
+FAQ_SEARCH_LIMIT = 10
+FAQ_SEARCH_SNIPPET_LENGTH = 80
+FAQ_SUGGEST_LIMIT = 3
+FAQ_SUGGEST_MAX_DISTANCE = 2
+FAQ_SUGGEST_CANDIDATES = 20
+FAQ_SUGGEST_COOLDOWN = 30.0
+FAQ_AUTOCOMPLETE_LIMIT = 25
+FAQ_DESCRIPTION_MAX_LENGTH = 4096
+FAQ_IMPORT_MAX_BYTES = 1_000_000
+
 MONGO_PORT = 27017
 MONGO_DATABASE = "windia"
 MONGO_COLLECTION_COMMANDS = "commands"
 MONGO_COLLECTION_ALIASES = "aliases"
+MONGO_MAX_WORKERS = 4
+MONGO_WATCH_MAX_AWAIT_MS = 1000
+MONGO_WATCH_RETRY_DELAY = 5.0
+MONGO_EXPORT_BATCH_SIZE = 100
+
+FAQ_SNAPSHOT_PATH = Path(__file__).parent.parent / "faq.snapshot"
+FAQ_SNAPSHOT_VERSION = 1
+
+TCP_REQUEST_TIMEOUT = 10.0
+TCP_BREAKER_THRESHOLD = 3
+TCP_PROBE_INTERVAL = 5.0
+TCP_CACHE_SIZE = 512
+TCP_CACHE_TTL = 3600.0
+TCP_MAX_PENDING = 32
+
+EXECUTOR_MAX_WORKERS = 2
+EXECUTOR_MAX_QUEUE = 16
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9100
+METRICS_LATENCY_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1., 2.5, 5., 10.)
+
+TRACE_SLOW_THRESHOLD = 2.0
+
+LEVELING_PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+WINDIA_EES_MESO_COST = 175000000.
+WINDIA_EES_SF_PROT_CREDITS_COST = 2500.
+WINDIA_EES_SF_PROT_VP_COST = 5.
+WINDIA_EES_SAMPLES = 10000
+WINDIA_EES_QUANTILES = (50, 90, 99)
+WINDIA_EES_REDUCTION_RATE = 0.05
+WINDIA_EES_MIN_RATE = 0.10
+WINDIA_EES_BASE_RATE = 0.75
+WINDIA_AEES_MIN_RATE = 0.30
+WINDIA_AEES_BASE_RATE = 0.95
+WINDIA_AEES_COG_COST = 15.
+WINDIA_AEES_EES_COST = 1.
+
+# bump when a formula behind the calculator lookup tables changes
+WINDIA_CALCULATOR_TABLE_VERSION = 1
+
+WINDIA_MAGIC_STAFF_MULTIPLIER = 1.25
+WINDIA_MAGIC_ELEMENTAL_ADVANTAGE_MULTIPLIER = 1.50
+WINDIA_MAGIC_ELEMENTAL_DISADVANTAGE_MULTIPLIER = 0.50
+WINDIA_MAGIC_FPIL_ELEMENTAL_AMP_MULTIPLIER = 1.40
+WINDIA_MAGIC_BW_ELEMENTAL_AMP_MULTIPLIER = 1.30
+WINDIA_MAGIC_MAX_MAGIC = 100000
+
+WINDIA_FLAME_EFLAME_MIN_RANGE = 4.
+WINDIA_FLAME_EFLAME_MAX_RANGE = 10.
+WINDIA_FLAME_PFLAME_MIN_RANGE = 1.
+WINDIA_FLAME_PFLAME_MAX_RANGE = 7.
+WINDIA_FLAME_OVERALL_MULTIPLIER = 2.
+WINDIA_FLAME_MAX_LEVEL = 250
 
 LOSSDIA_BOT_ID = 614221348780113920
 LOSSDIA_BOT_CHANNEL_ID = 923221574016958474
@@ -1,2 +1,5 @@
-from .client import TCPClient
-from .response import Response
\ No newline at end of file
+from .breaker import CircuitBreaker, CircuitOpenError
+from .cache import ResultCache
+from .client import RequestTimeoutError, TCPClient
+from .response import Response, ServerResponseError
+from .singleflight import SingleFlight
@@ -0,0 +1,49 @@
+__all__ = ["CircuitBreaker", "CircuitOpenError"]
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the server is considered unhealthy"""
+
+
+class CircuitBreaker:
+    """Tracks consecutive failures of a remote service
+
+    Once `threshold` failures happen in a row the circuit opens and requests
+    should fail fast until :meth:`record_success` closes it again
+
+    Attributes
+    ----------
+    threshold : :class:`int`
+        The amount of consecutive failures that opens the circuit
+
+    failures : :class:`int`
+        The current amount of consecutive failures
+    """
+    def __init__(self, threshold: int) -> None:
+        self.threshold = threshold
+        self.failures = 0
+        self.is_open = False
+
+    def check(self) -> None:
+        """Raises :class:`CircuitOpenError` if the circuit is open"""
+        if self.is_open:
+            raise CircuitOpenError("the circuit is open")
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.is_open = False
+
+    def record_failure(self) -> bool:
+        """Records a failure
+
+        Returns
+        -------
+        :class:`bool`
+            Whether or not this failure opened the circuit
+        """
+        self.failures += 1
+        if self.is_open or self.failures < self.threshold:
+            return False
+
+        self.is_open = True
+        return True
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from typing import Any, Hashable
+import time
+
+from windiafaq.tcp.response import Response
+
+
+__all__ = ["ResultCache", "make_key"]
+
+
+def _normalize(arg: Any) -> Any:
+    if not isinstance(arg, str):
+        return arg
+
+    tokens = arg.split()
+    if tokens and all(token.startswith("-") for token in tokens):
+        # flags are read in any order, so `-es`, `-se` and `-s -e` are sorted
+        # into one key. Repeats are kept, the server refuses some of them
+        return " ".join(sorted("-" + "".join(sorted(token[1:])) for token in tokens))
+
+    return arg.strip()
+
+
+def make_key(command: str, args: tuple) -> tuple[Hashable, ...]:
+    """Normalizes a command and its converted arguments into a cache key
+
+    String arguments are stripped, and flag arguments are put in a canonical
+    order so the same call always gets the same key
+
+    Parameters
+    ----------
+    command : :class:`str`
+        The name of the command
+
+    args : :class:`tuple`
+        The arguments of the command after conversion
+    Returns
+    -------
+    :class:`tuple`
+        A hashable key identifying the command call
+    """
+    return (command, *(_normalize(arg) for arg in args))
+
+
+class ResultCache:
+    """A LRU cache with a time to live for decoded server responses
+
+    Attributes
+    ----------
+    maxsize : :class:`int`
+        The maximum amount of responses to keep
+
+    ttl : :class:`float`
+        The amount of seconds a response stays valid
+
+    hits : :class:`int`
+        The amount of lookups answered by the cache
+
+    misses : :class:`int`
+        The amount of lookups that were not answered by the cache
+    """
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._entries: OrderedDict[Hashable, tuple[float, Response]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+    def get(self, key: Hashable) -> Response | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, response: Response) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,37 +1,200 @@
 import asyncio
+import json
+import time
+import uuid
 
 from loguru import logger
 import zmq
 import zmq.asyncio
 
-from windiafaq.tcp.response import Response
+from windiafaq import static
+from windiafaq import tracing
+from windiafaq.metrics import TCP_SECONDS
+from windiafaq.tcp.breaker import CircuitBreaker, CircuitOpenError
+from windiafaq.tcp.cache import ResultCache
+from windiafaq.tcp.response import Response, ServerResponseError
+from windiafaq.tcp.singleflight import SingleFlight
+
+
+class RequestTimeoutError(Exception):
+    """Raised when the server did not reply to a request before its deadline"""
 
 
 class TCPClient:
+    """A client for the calculator server
+
+    Requests are sent over a single DEALER socket tagged with a request id, so
+    any number of them can be in flight at once. Replies are matched back to
+    the awaiting coroutine by that id
+
+    After :data:`static.TCP_BREAKER_THRESHOLD` timeouts in a row the circuit
+    opens: the socket is reset, requests fail fast with :class:`CircuitOpenError`
+    and a background probe pings the server until it answers again
+    """
     def __init__(self, endpoint: str) -> None:
         self.endpoint = endpoint
 
         self.context = zmq.asyncio.Context()
-        self.sock: zmq.asyncio.Socket = self.context.socket(zmq.REQ)
+        self.sock: zmq.asyncio.Socket = self.context.socket(zmq.DEALER)
+        self.breaker = CircuitBreaker(static.TCP_BREAKER_THRESHOLD)
+        self.cache = ResultCache(static.TCP_CACHE_SIZE, static.TCP_CACHE_TTL)
+        self.flights = SingleFlight()
 
-    async def send_command(self, command: str, *args: list[int | str | bool]) -> None:
-        while self.sock._state == zmq.POLLIN:
-            await asyncio.sleep(1)
+        self._pending: dict[str, asyncio.Future[Response]] = {}
+        self._receiver: asyncio.Task | None = None
+        self._probe: asyncio.Task | None = None
 
-        return await self.sock.send_json({"command": command, "args": args})
+    @property
+    def pending(self) -> int:
+        """The amount of requests waiting on a reply"""
+        return len(self._pending)
 
-    async def wait_response(self) -> Response:
-        return Response(**await self.sock.recv_json(0))
+    @property
+    def saturated(self) -> bool:
+        """Whether or not too many requests are waiting on a reply"""
+        return self.pending >= static.TCP_MAX_PENDING
 
-    def reconnect(self) -> None:
-        self.sock.close()
-        self.sock = self.context.socket(zmq.REQ)
-        self.sock.connect(self.endpoint)
+    async def request(self, command: str, *args: list[int | str | bool], timeout: float = static.TCP_REQUEST_TIMEOUT) -> Response:
+        """Sends a command to the server and waits for its reply
+
+        Parameters
+        ----------
+        command : :class:`str`
+            The name of the command to run on the server
+
+        args : :class:`list`[:class:`int` | :class:`str` | :class:`bool`]
+            The arguments of the command
+
+        timeout : :class:`float`
+            The amount of seconds to wait for a reply
+        Returns
+        -------
+        :class:`Response`
+            The decoded reply of the server
+        Raises
+        ------
+        :class:`CircuitOpenError`
+            The server is currently considered unhealthy
+        :class:`RequestTimeoutError`
+            The server did not reply in time
+        """
+        self.breaker.check()
+
+        try:
+            resp = await self._request(command, args, timeout)
+        except RequestTimeoutError:
+            if self.breaker.record_failure():
+                logger.warning("calculator server is unhealthy, opening the circuit")
+                self.reset()
+                self._probe = asyncio.create_task(self._health_probe())
+
+            raise
+        except ServerResponseError:
+            # the server answered, so it is healthy even if the command failed
+            self.breaker.record_success()
+            raise
+
+        self.breaker.record_success()
+        return resp
+
+    async def _request(self, command: str, args: tuple, timeout: float) -> Response:
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        envelope = {"id": request_id, "command": command, "args": args}
+        if (trace := tracing.current.get()) is not None:
+            envelope["trace"] = trace.trace_id
+
+        start = sent = time.perf_counter()
+        resp = None
+        result = "ok"
+        try:
+            # the empty frame is the envelope delimiter the server's REP workers expect
+            await self.sock.send_multipart([b"", json.dumps(envelope).encode()])
+            sent = time.perf_counter()
+
+            resp = await asyncio.wait_for(future, timeout)
+            return resp
+        except asyncio.TimeoutError:
+            result = "timeout"
+            raise RequestTimeoutError(f"{command} timed out after {timeout}s") from None
+        except ServerResponseError:
+            result = "error"
+            raise
+        except (CircuitOpenError, asyncio.CancelledError):
+            result = "cancelled"
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+            end = time.perf_counter()
+            TCP_SECONDS.observe(end - start, command=command, result=result)
+
+            if trace is not None:
+                self._trace(trace, resp, start, sent, end, result)
+
+    def _trace(self, trace: tracing.Trace, resp: Response | None, start: float, sent: float, end: float, result: str) -> None:
+        trace.add("tcp/send", start, sent - start)
+        if resp is None:
+            trace.add(f"tcp/wait ({result})", sent, end - sent)
+            return
+
+        server = trace.merge(resp.timings, sent)
+        # whatever the server did not account for was spent on the wire and in its queue
+        trace.add("tcp/transport", sent, max(end - sent - server, 0.))
+
+    async def _receive(self) -> None:
+        while True:
+            frames = await self.sock.recv_multipart()
+            data = json.loads(frames[-1])
+
+            future = self._pending.get(data.pop("id", None))
+            if future is None or future.done():
+                logger.warning("dropping reply for an unknown request")
+                continue
+
+            try:
+                future.set_result(Response(**data))
+            except ServerResponseError as e:
+                future.set_exception(e)
+
+    async def _health_probe(self) -> None:
+        while self.breaker.is_open:
+            await asyncio.sleep(static.TCP_PROBE_INTERVAL)
+
+            try:
+                await self._request("ping", (), static.TCP_REQUEST_TIMEOUT)
+            except (RequestTimeoutError, ServerResponseError):
+                continue
+
+            logger.info("calculator server is healthy again, closing the circuit")
+            self.breaker.record_success()
+
+    def reset(self) -> None:
+        """Replaces the socket, failing every request still waiting on a reply"""
+        if self._receiver is not None:
+            self._receiver.cancel()
+
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(CircuitOpenError("the socket was reset"))
+
+        self.sock.close(0)
+        self.sock = self.context.socket(zmq.DEALER)
+        self.connect()
 
     def connect(self) -> None:
         self.sock.connect(self.endpoint)
+        self._receiver = asyncio.create_task(self._receive())
         logger.info("bound to {}", self.endpoint)
 
     def disconnect(self) -> None:
+        for task in (self._receiver, self._probe):
+            if task is not None:
+                task.cancel()
+
+        for future in self._pending.values():
+            future.cancel()
+
         self.sock.close(5)
         self.context.term()
@@ -8,21 +8,29 @@ class ServerResponseError(Exception):
 
 
 class Response(dict):
+    """The payload of a command's reply
+
+    The trace id and the server's span timings are kept apart from the payload,
+    in :attr:`timings`, so they are never cached or rendered
+    """
     def __init__(self, **kwargs):
+        kwargs.pop("trace", None)
+        self.timings: list[dict] = kwargs.pop("timings", None) or []
+
         if error := kwargs.pop("error", None):
             raise ServerResponseError(error)
             
         super().__init__(**kwargs)
 
     def embeds(self) -> list[discord.Embed] | None:
-        if not (embeds := self.pop("embeds", None)):
+        if not (embeds := self.get("embeds")):
             return None
 
         _embeds = []
 
         for embed in embeds:
             _embed = NormalEmbed(title=embed["title"], description=embed["description"])
-            if fields := embed.pop("fields"):
+            if fields := embed.get("fields"):
                 for field in fields:
                     _embed.add_field(EmbedField(name=field["name"], value=field["value"], inline=field["inline"]))
 
@@ -32,4 +40,4 @@ class Response(dict):
 
     @property
     def content(self) -> str | None:
-        return self.pop("content", None)
+        return self.get("content")
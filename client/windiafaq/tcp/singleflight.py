@@ -0,0 +1,40 @@
+from typing import Any, Awaitable, Callable, Hashable
+import asyncio
+
+
+__all__ = ["SingleFlight"]
+
+
+class SingleFlight:
+    """Coalesces identical in-flight calls
+
+    While a call for a key is running, later calls for the same key await the
+    same task instead of starting their own
+    """
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Runs `factory` unless a call for `key` is already in flight
+
+        Parameters
+        ----------
+        key : :class:`Hashable`
+            The key identifying the call
+
+        factory : :class:`Callable`[[], :class:`Awaitable`]
+            Creates the awaitable to run when no call is in flight
+        Returns
+        -------
+        :class:`Any`
+            The result of the shared call
+        """
+        if (task := self._flights.get(key)) is None:
+            task = self._flights[key] = asyncio.ensure_future(factory())
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+
+        # shielded so a cancelled caller does not cancel the call for everyone else
+        return await asyncio.shield(task)
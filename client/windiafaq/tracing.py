@@ -0,0 +1,169 @@
+"""Per-invocation traces of calculator commands
+
+A trace is started for every invocation and is carried across awaits through
+a context variable, so the modules it passes through add their spans without
+it being threaded through their signatures. Its id travels with the request
+to the server, which replies with the timings of its own spans to be merged in
+"""
+from contextvars import ContextVar
+from typing import Any, Iterator, NamedTuple
+import contextlib
+import time
+import uuid
+
+from loguru import logger
+
+from windiafaq import static
+
+
+__all__ = ["Span", "Trace", "current", "start_trace", "span"]
+
+
+class Span(NamedTuple):
+    """A timed piece of work within a trace
+
+    Attributes
+    ----------
+    name : :class:`str`
+        What the work was
+
+    start : :class:`float`
+        The seconds since the trace started at which the work started
+
+    duration : :class:`float`
+        The seconds the work took
+
+    source : :class:`str`
+        Where the work ran, `client` or `server`
+    """
+    name: str
+    start: float
+    duration: float
+    source: str = "client"
+
+
+class Trace:
+    """The spans recorded for one invocation of a command
+
+    Attributes
+    ----------
+    trace_id : :class:`str`
+        The id sent along with every request made for the invocation
+
+    name : :class:`str`
+        The name of the invoked command
+
+    spans : :class:`list`[:class:`Span`]
+        The spans recorded so far, in the order they finished
+    """
+    def __init__(self, name: str) -> None:
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.spans: list[Span] = []
+        self._start = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """The seconds since the trace started"""
+        return time.perf_counter() - self._start
+
+    def offset(self, timestamp: float) -> float:
+        """The seconds between the start of the trace and a :func:`time.perf_counter` timestamp"""
+        return timestamp - self._start
+
+    def add(self, name: str, start: float, duration: float, source: str = "client") -> None:
+        """Records a span that has finished
+
+        Parameters
+        ----------
+        name : :class:`str`
+            What the work was
+
+        start : :class:`float`
+            The :func:`time.perf_counter` timestamp the work started at
+
+        duration : :class:`float`
+            The seconds the work took
+
+        source : :class:`str`
+            Where the work ran
+        """
+        self.spans.append(Span(name, self.offset(start), duration, source))
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Records the time spent in the block as a span, even if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter() - start)
+
+    def merge(self, timings: list[dict[str, Any]], sent: float) -> float:
+        """Merges the timings the server replied with into the trace
+
+        The server measures from when it received the request, its spans are
+        placed from `sent` on, the moment the request left the client
+
+        Parameters
+        ----------
+        timings : :class:`list`[:class:`dict`]
+            The timings of the server, in milliseconds
+
+        sent : :class:`float`
+            The :func:`time.perf_counter` timestamp the request was sent at
+        Returns
+        -------
+        :class:`float`
+            The seconds the server spent on the request
+        """
+        total = 0.
+        for timing in timings:
+            start = sent + timing["start"] / 1000
+            duration = timing["duration"] / 1000
+            self.add(timing["name"], start, duration, source="server")
+            total = max(total, timing["start"] / 1000 + duration)
+
+        return total
+
+    def format(self) -> str:
+        """The trace as one line per span, ordered by when they started"""
+        lines = [f"trace {self.trace_id} ({self.name}) took {self.elapsed * 1000:.2f}ms"]
+        for s in sorted(self.spans, key=lambda s: s.start):
+            lines.append(f"  {s.start * 1000:9.2f}ms +{s.duration * 1000:9.2f}ms  {s.source:<6}  {s.name}")
+
+        return "\n".join(lines)
+
+
+current: ContextVar[Trace | None] = ContextVar("trace", default=None)
+
+
+@contextlib.contextmanager
+def start_trace(name: str) -> Iterator[Trace]:
+    """Starts a trace for the block, logging it in full if it is slower than
+    :data:`static.TRACE_SLOW_THRESHOLD` seconds
+
+    Parameters
+    ----------
+    name : :class:`str`
+        The name of the invoked command
+    """
+    trace = Trace(name)
+    token = current.set(trace)
+    try:
+        yield trace
+    finally:
+        current.reset(token)
+        if trace.elapsed > static.TRACE_SLOW_THRESHOLD:
+            logger.warning("slow {}", trace.format())
+
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[None]:
+    """Records the block as a span of the current trace, if there is one"""
+    if (trace := current.get()) is None:
+        yield
+        return
+
+    with trace.span(name):
+        yield
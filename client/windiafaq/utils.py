@@ -1,20 +1,21 @@
-__all__ = ["make_columns"]
+from decimal import Decimal
+
+
+__all__ = ["make_columns", "format_float"]
 
 
 def make_columns(string_list: list[str], *, amount_columns: int = 3) -> str:
-    longest_command = len(max(string_list, key=len))
-    
-    chunked_strings: list[list[str]] = []
-
-    for i in range(0, len(string_list), amount_columns):
-        chunked_strings.append(string_list[i:i+amount_columns])
-
-    columns = ''
-    for chunked_string in chunked_strings:
-        line = ''
-        for string in chunked_string:
-            line += string + " " * (longest_command - len(string)) + "  "
-        
-        columns += line.strip() + "\n"
-
-    return columns
\ No newline at end of file
+    if not string_list:
+        return ""
+
+    width = max(map(len, string_list))
+    padded = [string.ljust(width) for string in string_list]
+    lines = ["  ".join(padded[i:i+amount_columns]).strip() for i in range(0, len(padded), amount_columns)]
+
+    return "\n".join(lines) + "\n"
+
+
+def format_float(value: float) -> str:
+    """Formats a float the way the calculator server does, with the fewest digits that round trip and no exponent"""
+    string = format(Decimal(repr(value)), "f")
+    return string[:-2] if string.endswith(".0") else string
@@ -3,13 +3,14 @@ package main
 import (
 	"log"
 	"os"
+	"runtime"
 
 	"github.com/jaczerob/server/internal/server"
 	"github.com/jaczerob/server/internal/server/listeners"
 )
 
 func main() {
-	server, err := server.NewServer(os.Getenv("SERVER_LISTEN_URI"))
+	server, err := server.NewServer(os.Getenv("SERVER_LISTEN_URI"), runtime.NumCPU())
 	if err != nil {
 		log.Fatal(err)
 	}
@@ -18,14 +19,11 @@ func main() {
 	server.RegisterListener(&listeners.Magic{})
 	server.RegisterListener(&listeners.EES{})
 	server.RegisterListener(&listeners.AEES{})
+	server.RegisterListener(&listeners.Ping{})
 
 	if err = server.Connect(); err != nil {
 		log.Fatal(err)
 	}
 
-	for {
-		if err = server.Listen(); err != nil {
-			server.HandleError(err)
-		}
-	}
+	log.Fatal(server.Serve())
 }
@@ -10,6 +10,8 @@ import (
 
 type Command struct {
 	event.BasicEvent
+	ID          string `json:"id"`
+	Trace       string `json:"trace,omitempty"`
 	CommandName string `json:"command"`
 	Args        Args   `json:"args"`
 	ReturnData  *ReturnData
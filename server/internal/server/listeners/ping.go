@@ -0,0 +1,18 @@
+package listeners
+
+import (
+	"github.com/jaczerob/server/internal/server"
+)
+
+type Ping struct{}
+
+var _ server.CommandListener = (*Ping)(nil)
+
+func (p *Ping) Name() string {
+	return "ping"
+}
+
+func (p *Ping) Run(c *server.Command) (r *server.ReturnData, err error) {
+	r = &server.ReturnData{Content: "pong"}
+	return
+}
@@ -13,6 +13,9 @@ type Embed struct {
 }
 
 type ReturnData struct {
-	Embeds  []Embed `json:"embeds,omitempty"`
-	Content string  `json:"content,omitempty"`
+	ID      string   `json:"id,omitempty"`
+	Trace   string   `json:"trace,omitempty"`
+	Embeds  []Embed  `json:"embeds,omitempty"`
+	Content string   `json:"content,omitempty"`
+	Timings []Timing `json:"timings,omitempty"`
 }
@@ -5,26 +5,38 @@ import (
 	"errors"
 	"fmt"
 	"log"
+	"time"
 
 	"github.com/gookit/event"
 	"github.com/pebbe/zmq4"
 )
 
+const workersEndpoint = "inproc://workers"
+
 type Server struct {
 	endpoint     string
-	socket       *zmq4.Socket
+	workers      int
+	frontend     *zmq4.Socket
+	backend      *zmq4.Socket
 	eventManager *event.Manager
 }
 
-func NewServer(endpoint string) (s *Server, err error) {
-	socket, err := zmq4.NewSocket(zmq4.REP)
+func NewServer(endpoint string, workers int) (s *Server, err error) {
+	frontend, err := zmq4.NewSocket(zmq4.ROUTER)
+	if err != nil {
+		return
+	}
+
+	backend, err := zmq4.NewSocket(zmq4.DEALER)
 	if err != nil {
 		return
 	}
 
 	s = &Server{
 		endpoint:     endpoint,
-		socket:       socket,
+		workers:      workers,
+		frontend:     frontend,
+		backend:      backend,
 		eventManager: event.NewManager("Server"),
 	}
 
@@ -32,56 +44,116 @@ func NewServer(endpoint string) (s *Server, err error) {
 }
 
 func (s *Server) Connect() (err error) {
-	return s.socket.Bind(s.endpoint)
+	if err = s.frontend.Bind(s.endpoint); err != nil {
+		return
+	}
+
+	return s.backend.Bind(workersEndpoint)
 }
 
 func (s *Server) Close() (err error) {
-	return s.socket.Close()
+	if err = s.frontend.Close(); err != nil {
+		return
+	}
+
+	return s.backend.Close()
 }
 
-func (s *Server) Listen() (err error) {
-	log.SetPrefix("server")
-	log.Println("waiting for command...")
+// Serve starts the workers and proxies requests from clients to them.
+// Every request carries the client's routing envelope, so replies are routed
+// back to the right client no matter which worker handled the request.
+func (s *Server) Serve() error {
+	for i := 0; i < s.workers; i++ {
+		go s.work(i)
+	}
+
+	return zmq4.Proxy(s.frontend, s.backend, nil)
+}
+
+func (s *Server) work(id int) {
+	socket, err := zmq4.NewSocket(zmq4.REP)
+	if err != nil {
+		log.Panic(err)
+	}
+
+	defer socket.Close()
+
+	if err = socket.Connect(workersEndpoint); err != nil {
+		log.Panic(err)
+	}
+
+	log.Printf("worker %d ready", id)
+	for {
+		if err = s.Listen(socket); err != nil {
+			log.Printf("worker %d: %v", id, err)
+		}
+	}
+}
 
-	msg, err := s.socket.Recv(0)
+func (s *Server) Listen(socket *zmq4.Socket) (err error) {
+	msg, err := socket.Recv(0)
 	if err != nil {
 		return
 	}
 
+	tracer := NewTracer()
+
+	start := time.Now()
 	var command *Command
 	if err = json.Unmarshal([]byte(msg), &command); err != nil {
+		s.HandleError(socket, "", "", err)
 		return
 	}
 
-	log.SetPrefix(fmt.Sprintf("| %s | ", command.Name()))
+	tracer.Span("server/decode", start)
 
-	log.Println("received command with args:", command.Args)
+	log.Printf("| %s | %s | received command with args: %v", command.Trace, command.Name(), command.Args)
+	start = time.Now()
 	if err = s.HandleCommand(command); err != nil {
+		s.HandleError(socket, command.ID, command.Trace, err)
 		return
 	}
 
-	log.Println("marshalling return data")
-	data, err := json.Marshal(command.GetReturnData())
+	tracer.Span("server/handle", start)
+
+	returnData := command.GetReturnData()
+	if returnData == nil {
+		returnData = &ReturnData{}
+	}
+
+	returnData.ID = command.ID
+	if command.Trace != "" {
+		returnData.Trace = command.Trace
+		returnData.Timings = tracer.Timings()
+	}
+
+	data, err := json.Marshal(returnData)
 	if err != nil {
+		s.HandleError(socket, command.ID, command.Trace, err)
 		return
 	}
 
-	log.Println("sending marshalled return data")
-	_, err = s.socket.SendBytes(data, zmq4.DONTWAIT)
+	log.Printf("| %s | %s | sending marshalled return data", command.Trace, command.Name())
+	_, err = socket.SendBytes(data, 0)
 	return
 }
 
-func (s *Server) HandleError(commandError error) {
+func (s *Server) HandleError(socket *zmq4.Socket, id string, trace string, commandError error) {
 	errorSend := map[string]string{
+		"id":    id,
 		"error": commandError.Error(),
 	}
 
+	if trace != "" {
+		errorSend["trace"] = trace
+	}
+
 	bytes, err := json.Marshal(&errorSend)
 	if err != nil {
 		log.Panic(err)
 	}
 
-	if _, err = s.socket.SendBytes(bytes, zmq4.DONTWAIT); err != nil {
+	if _, err = socket.SendBytes(bytes, 0); err != nil {
 		log.Panic(err)
 	}
 }
@@ -0,0 +1,38 @@
+package server
+
+import "time"
+
+// Timing is one span of work done for a command, in milliseconds since the
+// request was received. Timings are sent back so clients can merge them into
+// their own trace of the request.
+type Timing struct {
+	Name     string  `json:"name"`
+	Start    float64 `json:"start"`
+	Duration float64 `json:"duration"`
+}
+
+type Tracer struct {
+	received time.Time
+	timings  []Timing
+}
+
+func NewTracer() *Tracer {
+	return &Tracer{received: time.Now()}
+}
+
+// Span records the work named name that ran from start until now.
+func (t *Tracer) Span(name string, start time.Time) {
+	t.timings = append(t.timings, Timing{
+		Name:     name,
+		Start:    milliseconds(start.Sub(t.received)),
+		Duration: milliseconds(time.Since(start)),
+	})
+}
+
+func (t *Tracer) Timings() []Timing {
+	return t.timings
+}
+
+func milliseconds(d time.Duration) float64 {
+	return float64(d) / float64(time.Millisecond)
+}